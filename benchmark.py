@@ -0,0 +1,342 @@
+"""Benchmark suite for TrackMaster Pro.
+
+Generates synthetic sheets shaped like every DATA_SOURCES entry (plus the
+Kerry status tab), serves them from a local HTTP stand-in, runs the loading,
+search, date and table-filter paths against them and saves the timings as JSON.
+
+    python benchmark.py                             # 10k, 100k and 1M rows
+    python benchmark.py --sizes 10000 100000 --repeat 3
+    python benchmark.py --compare benchmark_results/previous.json
+
+With --compare, any benchmark whose median got slower than --threshold times
+the previous run is reported and the script exits with status 1.
+"""
+
+import argparse
+import functools
+import gc
+import http.server
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+RESULTS_DIR = os.path.join(BASE_DIR, "benchmark_results")
+
+# =============================================================================
+# SYNTHETIC SHEETS
+# =============================================================================
+
+COURIERS = np.array(["DHL", "FedEx", "UPS", "Aramex", "#N/A", "-", ""])
+DESTINATIONS = np.array(["UK", "US", "UAE", "DE", "FR", "SA", "PK"])
+STATUSES = np.array(["In Transit", "Delivered", "Out for Delivery", "Customs Hold", "", "N/A"])
+QC_STATUSES = np.array(["Pass", "Fail", "Pending", "N/A"])
+
+def order_ids(n, rng):
+    """IDs like 122129_34, unique per sheet"""
+    base = pd.Series(np.arange(120000, 120000 + n)).astype(str)
+    suffix = pd.Series(rng.integers(1, 100, n)).astype(str)
+    return (base + "_" + suffix).to_numpy()
+
+def dates(n, rng, fmt):
+    """Dates over the last year in sheet order, as the given strftime format"""
+    days = np.sort(rng.integers(0, 365, n))
+    return (pd.Timestamp("2025-10-01") + pd.to_timedelta(days, unit="D")).strftime(fmt)
+
+def pick(values, n, rng):
+    return values[rng.integers(0, len(values), n)]
+
+def make_sheets(n, seed=0):
+    """One frame per source name, with the order/date/box/weight columns the app looks for"""
+    rng = np.random.default_rng(seed)
+    ids = order_ids(n, rng)
+
+    def shuffled_ids():
+        return ids[rng.permutation(n)]
+
+    def boxes():
+        return rng.integers(1, 9, n)
+
+    def weight():
+        return np.round(rng.random(n) * 25, 2)
+
+    return {
+        "ECL QC Center": pd.DataFrame({
+            "Fleek ID": ids,
+            "Fleek Handover Date": dates(n, rng, "%d/%m/%Y"),
+            "Courier": pick(COURIERS, n, rng),
+            "Service": pick(np.array(["Air", "Sea", "Express"]), n, rng),
+            "QC Status": pick(QC_STATUSES, n, rng),
+            "Boxes": boxes(),
+            "Weight (kg)": weight(),
+            "Destination": pick(DESTINATIONS, n, rng),
+            "Customer Name": pd.Series(np.arange(n)).map("Customer {}".format).to_numpy(),
+        }),
+        "ECL Zone": pd.DataFrame({
+            "Order#": shuffled_ids(),
+            "Date": dates(n, rng, "%d/%m/%Y"),
+            "AWB": pd.Series(np.arange(n)).map("AWB{:08d}".format).to_numpy(),
+            "Tracking ID": pd.Series(np.arange(n)).map("TRK{:08d}".format).to_numpy(),
+            "Courier": pick(COURIERS, n, rng),
+            "Boxes": boxes(),
+            "Weight": weight(),
+        }),
+        "GE QC Center": pd.DataFrame({
+            "Order Num": shuffled_ids(),
+            "GE Entry Date": dates(n, rng, "%Y-%m-%d"),
+            "QC Status": pick(QC_STATUSES, n, rng),
+            "Box Count": boxes(),
+            "Chargeable Weight": weight(),
+            "Consignee": pd.Series(np.arange(n)).map("Consignee {}".format).to_numpy(),
+            "Country": pick(DESTINATIONS, n, rng),
+        }),
+        "GE Zone": pd.DataFrame({
+            "Order No": shuffled_ids(),
+            "Handover Date": dates(n, rng, "%d-%m-%Y"),
+            "GE AWB": pd.Series(np.arange(n)).map("GE{:09d}".format).to_numpy(),
+            "GE Comment / Tracking": pick(np.array(["Received", "Dispatched", "-", ""]), n, rng),
+            "Boxes": boxes(),
+            "Weight": weight(),
+        }),
+        "APX": pd.DataFrame({
+            "Fleek ID": shuffled_ids(),
+            "Date": dates(n, rng, "%d %b %Y"),
+            "APX AWB Number": pd.Series(np.arange(n)).map("APX{:08d}".format).to_numpy(),
+            "Courier_Service": pick(COURIERS, n, rng),
+            "Box_Count": boxes(),
+            "Weight_Kgs": weight(),
+            "Destination": pick(DESTINATIONS, n, rng),
+        }),
+        "Kerry": pd.DataFrame({
+            "_Order": shuffled_ids(),
+            "Date": dates(n, rng, "%d/%m/%Y"),
+            "Kerry AWB Number": pd.Series(np.arange(n)).map("KE{:09d}".format).to_numpy(),
+            "Courier": pick(COURIERS, n, rng),
+            "Boxes": boxes(),
+            "Weight": weight(),
+            "Destination": pick(DESTINATIONS, n, rng),
+        }),
+        "_kerry_status_tab": pd.DataFrame({
+            "fleek_id": shuffled_ids(),
+            "latest_status": pick(STATUSES, n, rng),
+            "updated": dates(n, rng, "%d/%m/%Y"),
+        }),
+    }
+
+def write_sheets(sheets, directory):
+    """Write each sheet as CSV; returns {source name: file name}"""
+    files = {}
+    for name, df in sheets.items():
+        files[name] = name.strip("_").replace(" ", "_").lower() + ".csv"
+        df.to_csv(os.path.join(directory, files[name]), index=False)
+    return files
+
+# =============================================================================
+# LOCAL HTTP STAND-IN
+# =============================================================================
+
+class QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+def serve(directory):
+    """Serve directory over HTTP on a free local port; returns (server, base url)"""
+    handler = functools.partial(QuietHandler, directory=directory)
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/"
+
+# =============================================================================
+# TIMING
+# =============================================================================
+
+def timed(fn, repeat):
+    """Run fn repeat times; returns the timings summary and the last result"""
+    runs = []
+    for _ in range(repeat):
+        # Drop the previous result first so large loads never hold two copies
+        result = None
+        gc.collect()
+        started = time.perf_counter()
+        result = fn()
+        runs.append((time.perf_counter() - started) * 1000)
+    summary = {
+        "median_ms": round(float(np.median(runs)), 3),
+        "min_ms": round(min(runs), 3),
+        "max_ms": round(max(runs), 3),
+        "runs": len(runs),
+    }
+    return summary, result
+
+def run_size(app, n, repeat, seed):
+    """Every benchmark for one sheet size"""
+    results = {}
+
+    with tempfile.TemporaryDirectory() as directory:
+        started = time.perf_counter()
+        sheets = make_sheets(n, seed)
+        files = write_sheets(sheets, directory)
+        results["generate_sheets_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        results["sheet_bytes"] = {name: os.path.getsize(os.path.join(directory, f)) for name, f in files.items()}
+
+        server, base_url = serve(directory)
+        try:
+            for name in app.DATA_SOURCES:
+                app.DATA_SOURCES[name]["url"] = base_url + files[name]
+            app.KERRY_STATUS_TAB_URL = base_url + files["_kerry_status_tab"]
+
+            results["load_all_data_cold"], (data, errors) = timed(app.load_all_data, max(1, min(repeat, 3)))
+            if errors:
+                raise RuntimeError(f"load failed: {errors}")
+            results["load_all_data_revalidate"], _ = timed(lambda: app.load_all_data(data), repeat)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    app.st.session_state.all_data = data
+    rng = np.random.default_rng(seed + 1)
+    ids = sheets["ECL QC Center"]["Fleek ID"].to_numpy()
+    exact_id = ids[rng.integers(0, n)]
+    partial_id = exact_id.split("_")[0][1:]
+    batch_ids = list(ids[rng.integers(0, n, 100)])
+
+    # Searches before the order table is ready probe each source's own index
+    results["batch_search_100_no_table"], _ = timed(lambda: app.batch_search(batch_ids), repeat)
+
+    # Built once per load in the background (publish_data); timed here on its own
+    results["build_order_table"], orders = timed(lambda: app.build_order_table(data), 1)
+    app.get_data_cache()["orders"] = (data, orders)
+
+    # What a Global Search does before rendering: find the rows, then read their card values.
+    # The first search after a load pays for lazily built lookup tables.
+    def search(order_ids):
+        found = app.batch_search(order_ids)
+        return found, app.result_field_values(found)
+
+    results["search_first"], _ = timed(lambda: search([exact_id]), 1)
+    results["search_exact"], _ = timed(lambda: search([exact_id]), repeat)
+    results["search_partial"], _ = timed(lambda: search([partial_id]), repeat)
+    results["search_batch_100"], _ = timed(lambda: search(batch_ids), repeat)
+    results["batch_search_1000"], _ = timed(lambda: app.batch_search(list(ids[rng.integers(0, n, 1000)])), repeat)
+    # Repeat lookups of the same IDs (another agent, another order) are served by the search cache
+    app.st.session_state.data_version = n
+    app.cached_batch_search(batch_ids)
+    results["cached_batch_search_100_hit"], _ = timed(lambda: app.cached_batch_search(batch_ids[::-1]), repeat)
+    page = app.batch_search(batch_ids).head(100)
+    results["result_cards_html_100"], _ = timed(lambda: "".join(
+        app.result_card_html(result, values)
+        for result, (_, values) in zip(page.itertuples(index=False), app.result_field_values(page).iterrows())
+    ), repeat)
+    bulk_ids = list(ids[rng.integers(0, n, 10000)])
+    results["run_bulk_search_10000"], _ = timed(lambda: app.run_bulk_search(bulk_ids), repeat)
+    results["order_overlap"], _ = timed(lambda: app.order_overlap(orders, ["ECL Zone", "Kerry"]), repeat)
+    results["get_latest_status_from_kerry"], _ = timed(lambda: app.get_latest_status_from_kerry(exact_id), repeat)
+
+    ecl = data["ECL QC Center"]
+    results["smart_parse_date"], _ = timed(lambda: app.smart_parse_date(ecl["df"][ecl["date_col"]]), repeat)
+
+    # calculate_stats was replaced by the load-time daily totals read through get_range_stats
+    start, end = pd.Timestamp("2026-01-01"), pd.Timestamp("2026-03-31 23:59:59")
+    results["get_range_stats"], _ = timed(lambda: app.get_range_stats(ecl, start, end), repeat)
+    results["filter_by_date"], _ = timed(lambda: app.filter_by_date(ecl, start, end), repeat)
+
+    ecl.pop("search_blob", None)
+    results["filter_table_text_first"], _ = timed(lambda: app.filter_table_text(ecl, ecl["df"], "dhl"), 1)
+    results["filter_table_text"], _ = timed(lambda: app.filter_table_text(ecl, ecl["df"], "dhl"), repeat)
+    results["filter_table_text_column"], _ = timed(lambda: app.filter_table_text(ecl, ecl["df"], "dhl", ["Courier"]), repeat)
+
+    results["memory_mb"] = {
+        name: round(entry["memory"]["after"] / 1024 / 1024, 2) for name, entry in data.items()
+    }
+    return results
+
+# =============================================================================
+# REPORTING
+# =============================================================================
+
+def environment():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR, capture_output=True, text=True, timeout=10
+        ).stdout.strip() or None
+    except Exception:
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+def compare(current, previous, threshold):
+    """Print median changes against a previous run; returns the benchmarks that regressed"""
+    regressions = []
+    for size, benchmarks in current["results"].items():
+        before = previous.get("results", {}).get(size, {})
+        for name, timing in benchmarks.items():
+            if not isinstance(timing, dict) or "median_ms" not in timing:
+                continue
+            old = before.get(name, {}).get("median_ms")
+            if not old:
+                continue
+            ratio = timing["median_ms"] / old
+            flag = "  REGRESSION" if ratio > threshold else ""
+            print(f"{size:>9} {name:32} {old:10.2f} → {timing['median_ms']:10.2f} ms  x{ratio:5.2f}{flag}")
+            if ratio > threshold:
+                regressions.append(f"{size}/{name}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="rows per sheet")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per benchmark (cold loads run at most 3 times)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="results file (default benchmark_results/<timestamp>.json)")
+    parser.add_argument("--compare", help="previous results file to compare against")
+    parser.add_argument("--threshold", type=float, default=1.2, help="slowdown ratio reported as a regression")
+    args = parser.parse_args()
+
+    # Outside `streamlit run` every st.* call warns about the missing script context;
+    # this also silences the app's own JSON timing lines
+    logging.disable(logging.WARNING)
+    sys.path.insert(0, BASE_DIR)
+    import tid_tracker_pro_v2 as app
+
+    report = {"created": datetime.now().isoformat(timespec="seconds"), "environment": environment(), "results": {}}
+    for n in args.sizes:
+        print(f"Benchmarking {n:,} rows per sheet...", flush=True)
+        report["results"][str(n)] = run_size(app, n, args.repeat, args.seed)
+        for name, timing in report["results"][str(n)].items():
+            if isinstance(timing, dict) and "median_ms" in timing:
+                print(f"  {name:32} {timing['median_ms']:10.2f} ms")
+
+    output = args.output or os.path.join(RESULTS_DIR, datetime.now().strftime("%Y%m%d_%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Saved {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+        regressions = compare(report, previous, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Fetch layer tests against a local HTTP stand-in.
+
+Each test scripts the responses a path gives (status, delay, body) and checks
+how fetch_csv and load_all_data react: retries, non-retryable errors,
+revalidation, the per-source download deadline and partial availability.
+
+    python -m pytest -q test_fetch.py
+"""
+
+import http.server
+import logging
+import threading
+import time
+
+import pytest
+import requests
+
+logging.disable(logging.WARNING)
+
+import tid_tracker_pro_v2 as app
+
+CSV = b"Fleek ID,Courier\n120000_1,DHL\n120000_2,UPS\n"
+
+# =============================================================================
+# LOCAL HTTP STAND-IN
+# =============================================================================
+
+class ScriptedHandler(http.server.BaseHTTPRequestHandler):
+    """Answers each path from its script: one (status, delay, body) per request, the last one repeating"""
+    scripts = {}
+    requests_seen = {}
+
+    def do_GET(self):
+        self.requests_seen.setdefault(self.path, []).append(dict(self.headers))
+        script = self.scripts.get(self.path, [(404, 0, b"")])
+        status, delay, body = script[min(len(self.requests_seen[self.path]) - 1, len(script) - 1)]
+        time.sleep(delay)
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", '"v1"')
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def stand_in(monkeypatch):
+    """Scripted server plus a url() helper; backoff is shortened so retries do not slow the tests"""
+    ScriptedHandler.scripts = {}
+    ScriptedHandler.requests_seen = {}
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), ScriptedHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(app, "FETCH_BACKOFF_SECONDS", 0.01)
+    yield lambda path: f"http://127.0.0.1:{server.server_address[1]}{path}"
+    server.shutdown()
+    server.server_close()
+
+# =============================================================================
+# fetch_csv
+# =============================================================================
+
+def test_retries_server_errors_then_succeeds(stand_in):
+    ScriptedHandler.scripts["/sheet.csv"] = [(503, 0, b""), (200, 0, CSV)]
+    df, validators, outcome, metrics = app.fetch_csv(stand_in("/sheet.csv"))
+    assert outcome == "updated"
+    assert df["Fleek ID"].tolist() == ["120000_1", "120000_2"]
+    assert metrics["attempts"] == 2
+    assert validators["etag"] == '"v1"'
+
+def test_gives_up_after_the_retry_budget(stand_in):
+    ScriptedHandler.scripts["/sheet.csv"] = [(500, 0, b"")]
+    with pytest.raises(requests.exceptions.HTTPError):
+        app.fetch_csv(stand_in("/sheet.csv"))
+    assert len(ScriptedHandler.requests_seen["/sheet.csv"]) == app.FETCH_RETRIES + 1
+
+def test_client_errors_are_not_retried(stand_in):
+    ScriptedHandler.scripts["/sheet.csv"] = [(404, 0, b"")]
+    with pytest.raises(requests.exceptions.HTTPError):
+        app.fetch_csv(stand_in("/sheet.csv"))
+    assert len(ScriptedHandler.requests_seen["/sheet.csv"]) == 1
+
+def test_not_modified_keeps_previous_data(stand_in):
+    ScriptedHandler.scripts["/sheet.csv"] = [(304, 0, b"")]
+    df, validators, outcome, metrics = app.fetch_csv(stand_in("/sheet.csv"), {"etag": '"v1"'})
+    assert df is None and outcome == "not modified"
+    assert ScriptedHandler.requests_seen["/sheet.csv"][0]["If-None-Match"] == '"v1"'
+
+def test_unchanged_body_is_not_parsed(stand_in):
+    ScriptedHandler.scripts["/sheet.csv"] = [(200, 0, CSV)]
+    _, validators, _, _ = app.fetch_csv(stand_in("/sheet.csv"))
+    df, _, outcome, _ = app.fetch_csv(stand_in("/sheet.csv"), validators)
+    assert df is None and outcome == "unchanged"
+
+def test_slow_source_stops_at_its_timeout(stand_in):
+    ScriptedHandler.scripts["/slow.csv"] = [(200, 3, CSV)]
+    started = time.monotonic()
+    with pytest.raises(requests.exceptions.RequestException):
+        app.fetch_csv(stand_in("/slow.csv"), timeout=0.5)
+    assert time.monotonic() - started < 2
+
+# =============================================================================
+# load_all_data
+# =============================================================================
+
+def test_failed_source_does_not_block_the_others(stand_in, monkeypatch):
+    sources = {name: dict(config) for name, config in app.DATA_SOURCES.items()}
+    for name, config in sources.items():
+        path = "/" + name.replace(" ", "_").lower() + ".csv"
+        config["url"] = stand_in(path)
+        config["order_col"] = "Fleek ID"
+        ScriptedHandler.scripts[path] = [(200, 0, CSV)]
+    ScriptedHandler.scripts["/apx.csv"] = [(403, 0, b"")]
+    ScriptedHandler.scripts["/status.csv"] = [(200, 0, b"fleek_id,latest_status\n120000_1,Delivered\n")]
+    monkeypatch.setattr(app, "DATA_SOURCES", sources)
+    monkeypatch.setattr(app, "KERRY_STATUS_TAB_URL", stand_in("/status.csv"))
+
+    data, errors = app.load_all_data()
+    assert len(errors) == 1 and errors[0].startswith("APX:")
+    assert data["APX"]["outcome"] == "failed" and data["APX"]["df"].empty
+    assert all(len(data[name]["df"]) == 2 for name in sources if name != "APX")
+    assert data["_kerry_status_tab"]["status_lookup"]["120000_1"] == "Delivered"
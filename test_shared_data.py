@@ -0,0 +1,157 @@
+"""Shared data cache tests: publishing, revalidation and the order table built behind it.
+
+    python -m pytest -q test_shared_data.py
+"""
+
+import logging
+import time
+
+import pandas as pd
+import pytest
+
+logging.disable(logging.WARNING)
+
+import tid_tracker_pro_v2 as app
+
+def sheet(ids):
+    return pd.DataFrame({"Fleek ID": ids, "Courier": ["DHL"] * len(ids)})
+
+def make_data(ids):
+    """A data dict with every source holding the given order IDs"""
+    data = {name: app.make_entry(name, sheet(ids), "Fleek ID", outcome="updated") for name in app.DATA_SOURCES}
+    data["_kerry_status_tab"] = app.make_entry(
+        "_kerry_status_tab", pd.DataFrame({"fleek_id": ids, "latest_status": ["Delivered"] * len(ids)})
+    )
+    return data
+
+def not_modified(data):
+    """What a revalidation that got 304 for every sheet publishes: a new dict with the same entries"""
+    return {name: dict(entry, outcome="not modified") for name, entry in data.items()}
+
+def wait_for_table(cache, timeout=10):
+    deadline = time.monotonic() + timeout
+    while cache["orders_building"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not cache["orders_building"]
+
+@pytest.fixture
+def cache(monkeypatch, tmp_path):
+    """A fresh process-wide cache with snapshots written to a temporary directory"""
+    monkeypatch.setattr(app, "SNAPSHOT_DIR", str(tmp_path))
+    monkeypatch.setattr(app, "BACKGROUND_REFRESH_SECONDS", 0)
+    app.get_data_cache.clear()
+    yield app.get_data_cache()
+    app.get_data_cache.clear()
+
+# =============================================================================
+# ORDER TABLE
+# =============================================================================
+
+def test_order_table_survives_an_unchanged_refresh(cache):
+    app.publish_data(cache, make_data(["a1", "a2"]))
+    wait_for_table(cache)
+    orders = app.get_order_table(cache, cache["data"])
+    assert orders is not None and len(orders["table"]) == 2 * len(app.DATA_SOURCES)
+
+    version = cache["version"]
+    app.publish_data(cache, not_modified(cache["data"]))
+    assert cache["version"] == version
+    assert not cache["orders_building"]
+    assert app.get_order_table(cache, cache["data"]) is orders
+
+def test_order_table_is_rebuilt_when_a_sheet_changes(cache):
+    app.publish_data(cache, make_data(["a1", "a2"]))
+    wait_for_table(cache)
+
+    data = not_modified(cache["data"])
+    data["APX"] = app.make_entry("APX", sheet(["a1", "a2", "a3"]), "Fleek ID", outcome="updated")
+    app.publish_data(cache, data)
+    assert app.get_order_table(cache, data) is None
+    wait_for_table(cache)
+    assert len(app.get_order_table(cache, data)["table"]) == 2 * len(app.DATA_SOURCES) + 1
+
+def test_held_bytes_include_the_order_table(cache):
+    app.publish_data(cache, make_data(["a1", "a2"]))
+    wait_for_table(cache)
+    _, orders = cache["orders"]
+    assert cache["bytes"] == app.data_memory_bytes(cache["data"]) + orders["bytes"]
+
+# =============================================================================
+# REFRESH
+# =============================================================================
+
+def slow_revalidation(monkeypatch, seconds):
+    """Make load_all_data take a while and count how often it runs"""
+    calls = []
+    def load_all_data(previous=None, on_entry=None):
+        calls.append(previous)
+        time.sleep(seconds)
+        return not_modified(previous), []
+    monkeypatch.setattr(app, "load_all_data", load_all_data)
+    return calls
+
+def test_stale_access_serves_current_data_while_refreshing(cache, monkeypatch):
+    app.publish_data(cache, make_data(["a1"]))
+    data = cache["data"]
+    calls = slow_revalidation(monkeypatch, 0.5)
+    app.invalidate_data_cache()
+
+    started = time.monotonic()
+    for _ in range(5):
+        assert app.get_shared_data()[0] is data
+    assert time.monotonic() - started < 0.25
+    assert cache["refreshing"]
+
+    deadline = time.monotonic() + 5
+    while cache["refreshing"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not cache["refreshing"] and cache["data"] is not data
+    assert len(calls) == 1
+
+def test_single_source_refresh_does_not_wait_for_a_running_refresh(cache, monkeypatch):
+    app.publish_data(cache, make_data(["a1"]))
+    slow_revalidation(monkeypatch, 1)
+    newer = app.make_entry("APX", sheet(["a1", "a2"]), "Fleek ID", outcome="updated")
+    monkeypatch.setattr(app, "fetch_entry", lambda name, previous=None: newer)
+    app.invalidate_data_cache()
+    app.get_shared_data()
+
+    started = time.monotonic()
+    assert app.refresh_source("APX") is newer
+    assert time.monotonic() - started < 0.5
+    assert cache["refreshing"]
+
+    deadline = time.monotonic() + 5
+    while cache["refreshing"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert cache["data"]["APX"] is newer
+
+# =============================================================================
+# FAILURES
+# =============================================================================
+
+def logged_events(monkeypatch):
+    events = []
+    monkeypatch.setattr(app, "log_event", lambda event, **fields: events.append((event, fields)))
+    return events
+
+def test_failed_snapshot_is_logged(cache, monkeypatch, tmp_path):
+    events = logged_events(monkeypatch)
+    blocker = tmp_path / "not_a_directory"
+    blocker.write_text("")
+    monkeypatch.setattr(app, "SNAPSHOT_DIR", str(blocker))
+    app.save_snapshot(cache, make_data(["a1"]), ["APX"])
+    assert [(event, fields["sources"]) for event, fields in events] == [("snapshot_failed", ["APX"])]
+
+def test_failed_refresh_is_logged_and_keeps_the_data(cache, monkeypatch):
+    app.publish_data(cache, make_data(["a1"]))
+    data = cache["data"]
+    events = logged_events(monkeypatch)
+    def load_all_data(previous=None, on_entry=None):
+        raise RuntimeError("pool exhausted")
+    monkeypatch.setattr(app, "load_all_data", load_all_data)
+
+    cache["refreshing"] = True
+    app.refresh_all(cache)
+    assert events == [("refresh_failed", {"error": "pool exhausted"})]
+    assert cache["data"] is data and not cache["refreshing"]
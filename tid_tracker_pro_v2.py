@@ -1,10 +1,23 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
 import requests
-from io import StringIO
+import urllib3
+from io import BytesIO
 import concurrent.futures
 import time
 import re
+import os
+import json
+import logging
+import collections
+import random
+import hashlib
+import gzip
+import html
+import threading
 from datetime import datetime, timedelta
 
 st.set_page_config(
@@ -149,6 +162,7 @@ st.markdown("""
         border-bottom: 1px solid rgba(255,255,255,0.05);
     }
     
+    .field-grid { display: grid; grid-template-columns: 1fr 1fr; gap: 8px 16px; }
     .field-label { font-size: 0.65rem; font-weight: 600; text-transform: uppercase; color: #555; margin-bottom: 2px; }
     .field-value {
         background: rgba(255,255,255,0.03);
@@ -200,53 +214,118 @@ st.markdown("""
 # DATA SOURCES
 # =============================================================================
 
+# "timeout" is the most seconds a source may take to download, retries included,
+# before the app carries on without it. 120 s keeps the old per-read limit as the
+# budget for the whole download: sources load progressively, so a slow sheet over
+# the VPN delays only itself, and cutting it short would just drop that sheet.
 DATA_SOURCES = {
     "ECL QC Center": {
         "url": "https://docs.google.com/spreadsheets/d/e/2PACX-1vSCiZ1MdPMyVAzBqmBmp3Ch8sfefOp_kfPk2RSfMv3bxRD_qccuwaoM7WTVsieKJbA3y3DF41tUxb3T/pub?gid=0&single=true&output=csv",
         "order_col": "Fleek ID",
         "partner": "ECL",
         "type": "QC Center",
-        "icon": "🟠"
+        "icon": "🟠",
+        "timeout": 120
     },
     "ECL Zone": {
         "url": "https://docs.google.com/spreadsheets/d/e/2PACX-1vSCiZ1MdPMyVAzBqmBmp3Ch8sfefOp_kfPk2RSfMv3bxRD_qccuwaoM7WTVsieKJbA3y3DF41tUxb3T/pub?gid=928309568&single=true&output=csv",
         "order_col": 0,
         "partner": "ECL",
         "type": "Zone",
-        "icon": "🟠"
+        "icon": "🟠",
+        "timeout": 120
     },
     "GE QC Center": {
         "url": "https://docs.google.com/spreadsheets/d/e/2PACX-1vQjCPd8bUpx59Sit8gMMXjVKhIFA_f-W9Q4mkBSWulOTg4RGahcVXSD4xZiYBAcAH6eO40aEQ9IEEXj/pub?gid=710036753&single=true&output=csv",
         "order_col": "Order Num",
         "partner": "GE",
         "type": "QC Center",
-        "icon": "🔵"
+        "icon": "🔵",
+        "timeout": 120
     },
     "GE Zone": {
         "url": "https://docs.google.com/spreadsheets/d/e/2PACX-1vQjCPd8bUpx59Sit8gMMXjVKhIFA_f-W9Q4mkBSWulOTg4RGahcVXSD4xZiYBAcAH6eO40aEQ9IEEXj/pub?gid=10726393&single=true&output=csv",
         "order_col": 0,
         "partner": "GE",
         "type": "Zone",
-        "icon": "🔵"
+        "icon": "🔵",
+        "timeout": 120
     },
     "APX": {
         "url": "https://docs.google.com/spreadsheets/d/e/2PACX-1vRDEzAMUwnFZ7aoThGoMERtxxsll2kfEaSpa9ksXIx6sqbdMncts6Go2d5mKKabepbNXDSoeaUlk-mP/pub?gid=0&single=true&output=csv",
         "order_col": "Fleek ID",
         "partner": "APX",
         "type": "",
-        "icon": "🟣"
+        "icon": "🟣",
+        "timeout": 120
     },
     "Kerry": {
         "url": "https://docs.google.com/spreadsheets/d/e/2PACX-1vTZyLyZpVJz9sV5eT4Srwo_KZGnYggpRZkm2ILLYPQKSpTKkWfP9G5759h247O4QEflKCzlQauYsLKI/pub?gid=0&single=true&output=csv",
         "order_col": "_Order",
         "partner": "Kerry",
         "type": "",
-        "icon": "🟢"
+        "icon": "🟢",
+        "timeout": 120
     }
 }
 
 KERRY_STATUS_TAB_URL = "https://docs.google.com/spreadsheets/d/e/2PACX-1vTZyLyZpVJz9sV5eT4Srwo_KZGnYggpRZkm2ILLYPQKSpTKkWfP9G5759h247O4QEflKCzlQauYsLKI/pub?gid=2121564686&single=true&output=csv"
 
+# Loaded sources are shared by every session in the process and reloaded after this many seconds
+DATA_CACHE_TTL_SECONDS = 15 * 60
+
+# Timeout for sources without their own "timeout" (the Kerry status tab)
+FETCH_TIMEOUT_SECONDS = 120
+FETCH_CONNECT_TIMEOUT_SECONDS = 10
+
+# Failed downloads (connection errors, timeouts, 429/5xx) are retried after a jittered backoff
+FETCH_RETRIES = 2
+FETCH_BACKOFF_SECONDS = 1.0
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Rows per parse chunk when ingesting a sheet (bounds parser buffers); None parses in one pass
+CSV_CHUNK_ROWS = 50_000
+
+# Parquet copies of the last loaded sheets; a fresh server boots from here while sheets refresh
+SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".trackmaster_snapshot")
+
+# Search results per page; each page of cards is sent to the browser as one HTML block
+RESULT_PAGE_SIZES = [25, 50, 100]
+
+# Searches with more results than this open in the compact table view
+RESULT_CARD_VIEW_MAX = 100
+
+# Partial order-ID matches returned per ID and source when there is no exact hit
+PARTIAL_MATCH_LIMIT = 50
+
+# Memory budget of the process-wide search results cache (least recently used entries go first)
+SEARCH_CACHE_MB = 64
+
+# Bulk search from an uploaded ID file: most IDs read per file and IDs per batch_search call
+BULK_MAX_IDS = 100_000
+BULK_CHUNK_SIZE = 2_000
+
+# Every source is revalidated (ETag / Last-Modified / body hash) on this schedule; 0 disables it
+BACKGROUND_REFRESH_SECONDS = 5 * 60
+
+# Searches and reruns kept for the admin panel's timing history
+METRICS_HISTORY = 50
+
+# While sources are still arriving, open pages rerun this often to pick them up
+LOAD_POLL_SECONDS = 1.0
+
+# Rows per page offered by the data_page table; only the current page is sent to the browser
+TABLE_PAGE_SIZES = [100, 250, 500, 1000]
+
+# Download formats; a file is only generated when its button is clicked, then kept for repeat downloads
+EXPORT_FORMATS = {
+    "CSV": {"extension": "csv", "mime": "text/csv"},
+    "CSV (gzip)": {"extension": "csv.gz", "mime": "application/gzip"},
+    "Parquet": {"extension": "parquet", "mime": "application/vnd.apache.parquet"},
+}
+# Memory budget of the process-wide cache of generated download files (least recently used go first)
+EXPORT_CACHE_MB = 256
+
 # =============================================================================
 # DISPLAY FIELDS
 # =============================================================================
@@ -276,116 +355,1266 @@ DISPLAY_FIELDS = {
     ],
 }
 
+# =============================================================================
+# INSTRUMENTATION
+# =============================================================================
+
+# One JSON object per line on stderr, e.g. {"ts": ..., "event": "source_loaded", "source": "APX", ...}
+logger = logging.getLogger("trackmaster")
+if not logger.handlers:
+    log_handler = logging.StreamHandler()
+    log_handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(log_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+def log_event(event, **fields):
+    """Emit one structured JSON log line"""
+    logger.info(json.dumps({"ts": round(time.time(), 3), "event": event, **fields}, default=str))
+
+@st.cache_resource
+def get_metrics():
+    """Process-wide timing history for the admin panel"""
+    return {
+        "lock": threading.Lock(),
+        "searches": collections.deque(maxlen=METRICS_HISTORY),
+        "reruns": {},
+    }
+
+def record_search(timings):
+    metrics = get_metrics()
+    with metrics["lock"]:
+        metrics["searches"].append(timings)
+    log_event("search", **{key: round(value, 1) for key, value in timings.items()})
+
+def record_rerun(page, ms):
+    metrics = get_metrics()
+    with metrics["lock"]:
+        history = metrics["reruns"].setdefault(page, collections.deque(maxlen=METRICS_HISTORY))
+        history.append(ms)
+    log_event("rerun", page=page, ms=round(ms, 1))
+
+def source_metrics(name, entry):
+    """Flat per-source load figures for the admin panel and the source_loaded log line"""
+    fetch = entry.get("fetch") or {}
+    timings = entry.get("timings") or {}
+    return {
+        "source": name,
+        "outcome": entry.get("outcome"),
+        "rows": len(entry["df"]),
+        "load_s": round(entry.get("load_seconds") or 0, 2),
+        "attempts": fetch.get("attempts"),
+        "download_mb": round(fetch.get("bytes", 0) / 1024 / 1024, 2),
+        "download_ms": round(fetch.get("download_ms", 0)),
+        "parse_ms": round(fetch.get("parse_ms", 0)),
+        "compact_ms": round(timings.get("compact_ms", 0)),
+        "clean_ms": round(timings.get("clean_ms", 0)),
+        "sentinel_cells": sum((entry.get("sentinels") or {}).values()),
+        "index_ms": round(timings.get("index_ms", 0)),
+        "dates_ms": round(timings.get("dates_ms", 0)),
+        "memory_mb": round(entry["memory"]["after"] / 1024 / 1024, 2),
+        "error": entry.get("error"),
+    }
+
 # =============================================================================
 # DATA LOADING
 # =============================================================================
 
-def fetch_single_source(source_name):
+class HashingReader:
+    """File-like view of a response stream that hashes bytes as pandas reads them.
+    
+    Reading past the deadline raises a Timeout, bounding the whole download
+    rather than just the gap between packets.
+    """
+    
+    def __init__(self, raw, deadline=None):
+        self.raw = raw
+        self.deadline = deadline
+        self.sha256 = hashlib.sha256()
+        self.bytes = 0
+        self.read_seconds = 0.0
+        # read1 returns whatever has arrived, so a slow stream still reaches the deadline check
+        self.read_raw = getattr(raw, "read1", raw.read)
+    
+    def read(self, size=-1):
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise requests.exceptions.Timeout("download took longer than the source timeout")
+        started = time.perf_counter()
+        chunk = self.read_raw(size)
+        self.read_seconds += time.perf_counter() - started
+        self.bytes += len(chunk)
+        self.sha256.update(chunk)
+        return chunk
+    
+    def read_all(self, chunk_size=1 << 16):
+        return b"".join(iter(lambda: self.read(chunk_size), b""))
+
+@st.cache_resource
+def get_http_session():
+    """Process-wide session so every fetch reuses pooled keep-alive connections"""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=len(DATA_SOURCES) + 1)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def is_retryable(error):
+    if isinstance(error, requests.exceptions.HTTPError):
+        return error.response is not None and error.response.status_code in RETRY_STATUS_CODES
+    return isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout, urllib3.exceptions.HTTPError))
+
+def chunk_cell_text(value):
+    """A cell of a column read as numbers in one CSV chunk, as the text a single pass would give"""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+def read_csv_stream(stream, dtype=None):
+    """Parse a CSV byte stream, optionally CSV_CHUNK_ROWS rows at a time"""
+    options = {"dtype": dtype, "encoding": "utf-8", "encoding_errors": "replace"}
+    if not CSV_CHUNK_ROWS:
+        return pd.read_csv(stream, **options)
+    
+    df = pd.concat(pd.read_csv(stream, chunksize=CSV_CHUNK_ROWS, **options), ignore_index=True)
+    # A column typed differently in two chunks (numbers in one, text in another) concatenates
+    # to objects mixing ints and strs; read it as text, as one read_csv pass would
+    for col in df.columns[df.dtypes == object]:
+        df[col] = df[col].map(chunk_cell_text, na_action="ignore").astype("str")
+    return df
+
+def fetch_csv(url, validators=None, dtype=None, timeout=None):
+    """Download a CSV, revalidating against the validators of the previous load.
+    
+    Returns (df, validators, outcome, metrics); df is None when the sheet is
+    unchanged, either because the server answered 304 or because the body hash
+    matches. Transient failures are retried with jittered backoff for up to timeout
+    seconds in total, after which the last error is raised.
+    """
+    deadline = time.monotonic() + (timeout or FETCH_TIMEOUT_SECONDS)
+    for attempt in range(FETCH_RETRIES + 1):
+        try:
+            df, new_validators, outcome, metrics = fetch_csv_once(url, validators or {}, dtype, deadline)
+            metrics["attempts"] = attempt + 1
+            return df, new_validators, outcome, metrics
+        except Exception as e:
+            # Full jitter keeps sessions that failed together from retrying together
+            delay = random.uniform(0, FETCH_BACKOFF_SECONDS * 2 ** attempt)
+            if attempt == FETCH_RETRIES or not is_retryable(e) or time.monotonic() + delay >= deadline:
+                raise
+            time.sleep(delay)
+
+def fetch_csv_once(url, validators, dtype, deadline):
+    """One download attempt for fetch_csv.
+    
+    A first load parses straight from the response stream; a revalidation
+    buffers only the raw bytes so an unchanged body is never parsed.
+    Parse time is the attempt's wall time minus time spent waiting on the network.
+    """
+    started = time.perf_counter()
+    headers = {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+    
+    read_timeout = max(deadline - time.monotonic(), 0.1)
+    timeout = (min(FETCH_CONNECT_TIMEOUT_SECONDS, read_timeout), read_timeout)
+    with get_http_session().get(url, headers=headers, timeout=timeout, stream=True) as response:
+        waited_for_headers = time.perf_counter() - started
+        if response.status_code == 304:
+            return None, validators, "not modified", {"bytes": 0, "download_ms": waited_for_headers * 1000, "parse_ms": 0.0}
+        response.raise_for_status()
+        
+        new_validators = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+        
+        response.raw.decode_content = True
+        reader = HashingReader(response.raw, deadline)
+        
+        def metrics():
+            download_ms = (waited_for_headers + reader.read_seconds) * 1000
+            total_ms = (time.perf_counter() - started) * 1000
+            return {"bytes": reader.bytes, "download_ms": download_ms, "parse_ms": total_ms - download_ms}
+        
+        if validators.get("body_hash"):
+            body = reader.read_all()
+            new_validators["body_hash"] = reader.sha256.hexdigest()
+            if new_validators["body_hash"] == validators["body_hash"]:
+                return None, new_validators, "unchanged", metrics()
+            return read_csv_stream(BytesIO(body), dtype), new_validators, "updated", metrics()
+        
+        df = read_csv_stream(reader, dtype)
+        new_validators["body_hash"] = reader.sha256.hexdigest()
+        return df, new_validators, "updated", metrics()
+
+def make_entry(name, df, order_col=None, **meta):
+    """Wrap a freshly loaded frame with the lookup structures built once per load"""
+    timings = {}
+    started = time.perf_counter()
+    
+    def lap(step):
+        nonlocal started
+        now = time.perf_counter()
+        timings[step] = (now - started) * 1000
+        started = now
+    
+    df, memory = compact_frame(df, order_col)
+    lap("compact_ms")
+    sentinels = clean_sentinels(df)
+    lap("clean_ms")
+    if name == "_kerry_status_tab":
+        entry = {"df": df, "memory": memory, "status_lookup": build_status_lookup(df)}
+        lap("index_ms")
+    else:
+        entry = {
+            "df": df,
+            "memory": memory,
+            "order_col": order_col,
+            "index": build_order_index(df, order_col),
+            "field_columns": resolve_field_columns(df.columns),
+            "stats_columns": find_stats_columns(df.columns),
+        }
+        lap("index_ms")
+        entry.update(parse_source_dates(df))
+        lap("dates_ms")
+        entry["daily_totals"] = build_daily_totals(df, entry["parsed_dates"], entry["stats_columns"])
+        lap("totals_ms")
+    entry["timings"] = timings
+    entry["sentinels"] = sentinels
+    entry.update(meta)
+    return entry
+
+def fetch_single_source(source_name, previous=None):
+    """Fetch one partner sheet; an unchanged sheet keeps the previous entry and index"""
     try:
         config = DATA_SOURCES[source_name]
-        response = requests.get(config["url"], timeout=120)
-        response.raise_for_status()
-        df = pd.read_csv(StringIO(response.text))
+        df, validators, outcome, fetch = fetch_csv(
+            config["url"], previous and previous.get("validators"),
+            dtype={config["order_col"]: str}, timeout=config.get("timeout")
+        )
+        
+        if df is None:
+            return source_name, dict(previous, validators=validators, outcome=outcome, checked_at=time.time(), error=None, fetch=fetch)
         
         order_col = config["order_col"]
         if isinstance(order_col, int):
             order_col = df.columns[order_col] if order_col < len(df.columns) else None
         
-        return source_name, df, order_col, None
+        return source_name, make_entry(
+            source_name, df, order_col,
+            validators=validators, outcome=outcome, checked_at=time.time(), error=None, fetch=fetch
+        )
     except Exception as e:
-        return source_name, pd.DataFrame(), None, str(e)
+        if previous:
+            return source_name, dict(previous, checked_at=time.time(), error=str(e))
+        return source_name, make_entry(
+            source_name, pd.DataFrame(),
+            validators={}, outcome="failed", checked_at=time.time(), error=str(e)
+        )
 
-def fetch_kerry_status_tab():
+def fetch_kerry_status_tab(previous=None):
     try:
-        response = requests.get(KERRY_STATUS_TAB_URL, timeout=120)
-        response.raise_for_status()
-        df = pd.read_csv(StringIO(response.text))
-        return df, None
+        df, validators, outcome, fetch = fetch_csv(
+            KERRY_STATUS_TAB_URL, previous and previous.get("validators"), dtype={"fleek_id": str}
+        )
+        
+        if df is None:
+            return dict(previous, validators=validators, outcome=outcome, checked_at=time.time(), error=None, fetch=fetch)
+        
+        return make_entry(
+            "_kerry_status_tab", df,
+            validators=validators, outcome=outcome, checked_at=time.time(), error=None, fetch=fetch
+        )
     except Exception as e:
-        return pd.DataFrame(), str(e)
+        if previous:
+            return dict(previous, checked_at=time.time(), error=str(e))
+        return make_entry(
+            "_kerry_status_tab", pd.DataFrame(),
+            validators={}, outcome="failed", checked_at=time.time(), error=str(e)
+        )
+
+def fetch_entry(name, previous=None):
+    if name == "_kerry_status_tab":
+        return fetch_kerry_status_tab(previous)
+    return fetch_single_source(name, previous)[1]
+
+def collect_load_errors(data):
+    errors = []
+    for name, d in data.items():
+        if d.get("error"):
+            label = "Kerry Status Tab" if name == "_kerry_status_tab" else name
+            errors.append(f"{label}: {d['error']}")
+    return errors
 
-def load_all_data():
-    data, errors = {}, []
+def fetch_timed(name, previous=None):
+    """fetch_entry, recording how long the source took as load_seconds"""
+    started = time.monotonic()
+    entry = dict(fetch_entry(name, previous), load_seconds=time.monotonic() - started)
+    log_event("source_loaded", **source_metrics(name, entry))
+    return name, entry
+
+def load_all_data(previous=None, on_entry=None):
+    """Fetch every source; pass the previous data to revalidate instead of re-downloading.
     
-    with concurrent.futures.ThreadPoolExecutor(max_workers=7) as executor:
-        futures = {executor.submit(fetch_single_source, name): name for name in DATA_SOURCES.keys()}
-        status_future = executor.submit(fetch_kerry_status_tab)
-        
+    on_entry(name, entry) is called as each source completes, fastest first.
+    """
+    previous = previous or {}
+    data = {}
+    names = list(DATA_SOURCES.keys()) + ["_kerry_status_tab"]
+    
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(names)) as executor:
+        futures = [executor.submit(fetch_timed, name, previous.get(name)) for name in names]
         for future in concurrent.futures.as_completed(futures):
-            result = future.result()
-            source_name, df, order_col, error = result
-            data[source_name] = {"df": df, "order_col": order_col}
-            if error:
-                errors.append(f"{source_name}: {error}")
+            name, entry = future.result()
+            data[name] = entry
+            if on_entry:
+                on_entry(name, entry)
+    
+    return data, collect_load_errors(data)
+
+# =============================================================================
+# SNAPSHOT
+# =============================================================================
+
+def snapshot_path(name):
+    return os.path.join(SNAPSHOT_DIR, re.sub(r"\W+", "_", name).strip("_").lower() + ".parquet")
+
+def write_atomic(path, write):
+    """Write through a temp file in the same directory, then rename over the target"""
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def to_parquet_safe(df, path):
+    try:
+        df.to_parquet(path, index=False)
+    except Exception:
+        # Object columns mixing numbers and strings cannot be typed by Arrow; store them as text
+        df = df.copy()
+        for col in df.columns[df.dtypes == object]:
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+        df.to_parquet(path, index=False)
+
+def save_snapshot(cache, data, names):
+    """Persist the given sources as Parquet files plus a manifest of their validators"""
+    with cache["snapshot_lock"]:
+        try:
+            os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+            manifest_path = os.path.join(SNAPSHOT_DIR, "manifest.json")
+            manifest = {}
+            if os.path.exists(manifest_path):
+                with open(manifest_path) as f:
+                    manifest = json.load(f)
+            
+            for name in names:
+                entry = data[name]
+                if entry.get("error") or entry["df"].empty:
+                    continue
+                write_atomic(snapshot_path(name), lambda path: to_parquet_safe(entry["df"], path))
+                manifest[name] = {
+                    "order_col": entry.get("order_col"),
+                    "validators": entry.get("validators", {}),
+                    "saved_at": time.time(),
+                }
+            
+            def write_manifest(path):
+                with open(path, "w") as f:
+                    json.dump(manifest, f)
+            write_atomic(manifest_path, write_manifest)
+        except Exception as e:
+            log_event("snapshot_failed", sources=list(names), error=str(e))
+
+def load_snapshot():
+    """Rebuild entries from the last snapshot; returns None when there is nothing usable"""
+    try:
+        with open(os.path.join(SNAPSHOT_DIR, "manifest.json")) as f:
+            manifest = json.load(f)
+    except Exception:
+        return None
+    
+    data = {}
+    for name in list(DATA_SOURCES.keys()) + ["_kerry_status_tab"]:
+        meta = manifest.get(name)
+        try:
+            df = pd.read_parquet(snapshot_path(name))
+        except Exception:
+            df, meta = pd.DataFrame(), None
         
-        status_df, status_error = status_future.result()
-        data["_kerry_status_tab"] = {"df": status_df}
-        if status_error:
-            errors.append(f"Kerry Status Tab: {status_error}")
+        if meta is None:
+            data[name] = make_entry(
+                name, df, validators={}, outcome="not loaded yet", checked_at=None, error=None
+            )
+        else:
+            data[name] = make_entry(
+                name, df, meta.get("order_col"),
+                validators=meta.get("validators", {}), outcome="snapshot", checked_at=meta.get("saved_at"), error=None
+            )
+    
+    if all(d["df"].empty for d in data.values()):
+        return None
+    return data
+
+def data_memory_bytes(data):
+    """Approximate memory held by loaded frames and their lookup structures"""
+    total = 0
+    for d in data.values():
+        total += d["memory"]["after"]
+        if d.get("index") is not None:
+            total += d["index"]["bytes"]
+        if d.get("status_lookup") is not None:
+            total += int(d["status_lookup"].memory_usage(deep=True))
+    return total
+
+def held_bytes(cache):
+    """Memory held by the shared cache: the loaded sources plus the order table built over them"""
+    _, orders = cache["orders"]
+    return data_memory_bytes(cache["data"] or {}) + (orders["bytes"] if orders else 0)
+
+@st.cache_resource
+def get_data_cache():
+    """Process-wide holder for loaded sources, shared by every session"""
+    cache = {
+        "lock": threading.Lock(),
+        "snapshot_lock": threading.Lock(),
+        "data": None,
+        "errors": [],
+        "loaded_at": 0.0,
+        "version": 0,
+        "hits": 0,
+        "misses": 0,
+        "bytes": 0,
+        "loading": {},
+        "refreshing": False,
+        "orders_lock": threading.Lock(),
+        "orders": (None, None),
+        "orders_building": False,
+    }
+    if BACKGROUND_REFRESH_SECONDS > 0:
+        threading.Thread(target=background_refresh_loop, args=(cache,), daemon=True).start()
+    return cache
+
+def publish_data(cache, data):
+    """Swap in a new data dict and snapshot the sources whose frame actually changed"""
+    old = cache["data"] or {}
+    changed = [name for name in data if name not in old or data[name]["df"] is not old[name]["df"]]
+    
+    cache["data"] = data
+    cache["errors"] = collect_load_errors(data)
+    cache["loaded_at"] = time.time()
+    if changed:
+        cache["version"] += 1
+        cache["bytes"] = held_bytes(cache)
+        schedule_order_table(cache)
+        if not all(data[name].get("outcome") == "snapshot" for name in changed):
+            threading.Thread(target=save_snapshot, args=(cache, data, changed), daemon=True).start()
+
+def swap_entries(cache, entries, based_on):
+    """Publish fetched entries over the current data; the lock is held for the swap only, never a download.
+    
+    An entry is dropped when its source was replaced since based_on was read, so a
+    revalidation that finished late never puts older data back over a newer refresh.
+    """
+    based_on = based_on or {}
+    with cache["lock"]:
+        current = cache["data"] or {}
+        data = dict(current)
+        data.update({name: entry for name, entry in entries.items() if current.get(name) is based_on.get(name)})
+        publish_data(cache, data)
+
+def refresh_all(cache):
+    """Revalidate every source against the current data and swap the result in"""
+    try:
+        based_on = cache["data"]
+        data, _ = load_all_data(based_on)
+        swap_entries(cache, data, based_on)
+    except Exception as e:
+        # Runs in a background thread: log it, keep serving the current data and retry on the next round
+        log_event("refresh_failed", error=str(e))
+    finally:
+        cache["refreshing"] = False
+
+def start_refresh(cache):
+    """Run refresh_all in the background unless one is already running; call with cache["lock"] held"""
+    if cache["refreshing"]:
+        return False
+    cache["refreshing"] = True
+    threading.Thread(target=refresh_all, args=(cache,), daemon=True).start()
+    return True
+
+def load_progressively(cache):
+    """Cold load that publishes each source the moment it arrives, so the app is usable after the fastest one"""
+    def publish_entry(name, entry):
+        swap_entries(cache, {name: entry}, None)
+        # Swapped for a new dict, never changed in place: sessions iterate it without the lock
+        cache["loading"] = {key: started for key, started in cache["loading"].items() if key != name}
     
-    return data, errors
+    try:
+        load_all_data(on_entry=publish_entry)
+    finally:
+        cache["loading"] = {}
+        cache["refreshing"] = False
+
+def is_stale(cache):
+    """True when the shared data needs loading, or has outlived its TTL and no refresh is running yet"""
+    if cache["data"] is None:
+        return True
+    return time.time() - cache["loaded_at"] > DATA_CACHE_TTL_SECONDS and not cache["refreshing"]
+
+def get_shared_data():
+    cache = get_data_cache()
+    if is_stale(cache):
+        with cache["lock"]:
+            # Another session may have finished loading while we waited
+            if is_stale(cache):
+                cache["misses"] += 1
+                snapshot = load_snapshot() if cache["data"] is None else None
+                if snapshot is not None:
+                    # Serve the snapshot now and swap in fresh sheets once they arrive
+                    publish_data(cache, snapshot)
+                    start_refresh(cache)
+                elif cache["data"] is None:
+                    cache["data"] = {}
+                    cache["loaded_at"] = time.time()
+                    cache["loading"] = {name: time.time() for name in list(DATA_SOURCES.keys()) + ["_kerry_status_tab"]}
+                    # Counts as the running refresh, so the background loop does not start a second download
+                    cache["refreshing"] = True
+                    threading.Thread(target=load_progressively, args=(cache,), daemon=True).start()
+                else:
+                    # Keep serving the current sheets; the refresh swaps new ones in when it finishes
+                    start_refresh(cache)
+            else:
+                cache["hits"] += 1
+    else:
+        cache["hits"] += 1
+    return cache["data"], cache["errors"], cache["version"]
+
+def refresh_source(name):
+    """Revalidate a single source (or the Kerry status tab) and swap it into the shared cache"""
+    cache = get_data_cache()
+    based_on = cache["data"]
+    if based_on is None:
+        return None
+    entry = fetch_entry(name, based_on.get(name))
+    swap_entries(cache, {name: entry}, based_on)
+    return entry
+
+def background_refresh_loop(cache):
+    while True:
+        time.sleep(BACKGROUND_REFRESH_SECONDS)
+        with cache["lock"]:
+            if cache["data"] is not None:
+                start_refresh(cache)
+
+def invalidate_data_cache():
+    """Make the next access start a revalidation; sessions keep the current data until it finishes"""
+    cache = get_data_cache()
+    with cache["lock"]:
+        cache["loaded_at"] = 0.0
 
 def initialize_data():
-    if "data_loaded" not in st.session_state:
-        st.session_state.all_data, st.session_state.load_errors = load_all_data()
+    all_data, errors, version = get_shared_data()
+    st.session_state.all_data = all_data
+    st.session_state.load_errors = errors
+    if st.session_state.get("data_version") != version:
+        st.session_state.data_version = version
         st.session_state.data_loaded = True
         st.session_state.total_rows = sum(
-            len(d["df"]) for name, d in st.session_state.all_data.items() 
+            len(d["df"]) for name, d in all_data.items() 
             if name != "_kerry_status_tab"
         )
 
 # =============================================================================
-# HELPER FUNCTIONS
+# SEARCH INDEX
 # =============================================================================
 
-def get_latest_status_from_kerry(order_id):
-    try:
-        status_data = st.session_state.all_data.get("_kerry_status_tab", {})
-        df = status_data.get("df", pd.DataFrame())
+def normalize_order_keys(series):
+    """Normalize an order column the same way a typed search term is normalized"""
+    return series.astype(str).str.lower().str.strip()
+
+def build_order_index(df, order_col):
+    """Build normalized order key -> row positions for one source (once per load).
+    
+    Unique keys live in a hashed pd.Index; the rows of unique key ``i`` are
+    ``rows[offsets[i]:offsets[i + 1]]`` in original row order.
+    """
+    start = time.perf_counter()
+    
+    if df.empty or order_col is None or order_col not in df.columns:
+        keys = pd.Series(dtype=str)
+    else:
+        keys = normalize_order_keys(df[order_col])
+    
+    codes, uniques = pd.factorize(keys)
+    rows = np.argsort(codes, kind="stable")
+    rows = rows[np.count_nonzero(codes == -1):]
+    offsets = np.zeros(len(uniques) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(codes[codes >= 0], minlength=len(uniques)), out=offsets[1:])
+    
+    uniques = pd.Index(np.asarray(uniques, dtype=object), dtype=object)
+    partial = build_partial_index(uniques)
+    
+    size = int(keys.memory_usage(deep=True)) + int(uniques.memory_usage(deep=True))
+    size += rows.nbytes + offsets.nbytes + sum(
+        part.nbytes for part in partial.values() if isinstance(part, np.ndarray)
+    )
+    
+    return {
+        "keys": keys,
+        "uniques": uniques,
+        "rows": rows,
+        "offsets": offsets,
+        "partial": partial,
+        "build_ms": (time.perf_counter() - start) * 1000,
+        "bytes": size,
+    }
+
+def index_rows(index, codes):
+    """Row positions (ascending) for the given unique-key codes of an order index"""
+    offsets = index["offsets"]
+    parts = [index["rows"][offsets[code]:offsets[code + 1]] for code in codes]
+    return np.sort(np.concatenate(parts)) if parts else np.array([], dtype=np.intp)
+
+def build_partial_index(uniques, max_key_len=32):
+    """Sorted keys for prefix search plus trigram posting lists for infix search.
+    
+    Keys are held as a fixed-width unicode array so trigrams can be computed
+    with array ops. The width follows the 99.9th percentile key length (at most
+    max_key_len), so a few junk cells cannot widen every key; longer keys are
+    kept aside and scanned linearly.
+    """
+    values = uniques.to_numpy(dtype=object)
+    lengths = np.fromiter((len(key) for key in values), dtype=np.int64, count=len(values))
+    if len(lengths):
+        max_key_len = min(max_key_len, int(np.quantile(lengths, 0.999, method="higher")))
+    short = lengths <= max_key_len
+    
+    keys = values[short].astype(str)
+    order = np.argsort(keys, kind="stable")
+    keys, lengths = keys[order], lengths[short][order]
+    key_codes = np.flatnonzero(short)[order]
+    
+    alphabet = np.array([], dtype=np.uint32)
+    gram_codes = np.array([], dtype=np.int64)
+    gram_offsets = np.zeros(1, dtype=np.int64)
+    gram_key_ids = np.array([], dtype=np.int32)
+    width = keys.dtype.itemsize // 4
+    
+    if len(keys) and width >= 3:
+        chars = keys.view(np.uint32).reshape(len(keys), width)
+        present = np.zeros(int(chars.max()) + 1, dtype=bool)
+        present[chars.ravel()] = True
+        alphabet = np.flatnonzero(present).astype(np.uint32)
+        dense = (np.cumsum(present) - 1)[chars]
+        size = len(alphabet)
         
-        if df.empty or "fleek_id" not in df.columns:
-            return None
+        # Encode each (trigram, key id) pair as one integer so a single sort dedupes and groups them
+        pairs = []
+        for offset in range(width - 2):
+            valid = np.flatnonzero(lengths >= offset + 3)
+            grams = (dense[valid, offset] * size + dense[valid, offset + 1]) * size + dense[valid, offset + 2]
+            pairs.append(grams * len(keys) + valid)
+        pairs = np.sort(np.concatenate(pairs))
+        pairs = pairs[np.r_[True, pairs[1:] != pairs[:-1]]]
         
-        search_term = str(order_id).lower().strip()
-        df_search = df["fleek_id"].astype(str).str.lower().str.strip()
-        matches = df[df_search == search_term]
+        grams = pairs // len(keys)
+        starts = np.flatnonzero(np.r_[True, grams[1:] != grams[:-1]])
+        gram_codes = grams[starts]
+        gram_offsets = np.append(starts, len(grams)).astype(np.int64)
+        gram_key_ids = (pairs % len(keys)).astype(np.int32)
+    
+    return {
+        "keys": keys,
+        "key_codes": key_codes,
+        "alphabet": alphabet,
+        "gram_codes": gram_codes,
+        "gram_offsets": gram_offsets,
+        "gram_key_ids": gram_key_ids,
+        "long_keys": values[~short],
+        "long_codes": np.flatnonzero(~short),
+    }
+
+def trigram_candidates(partial, search_term):
+    """Key ids holding every trigram of search_term (a superset of the infix matches)"""
+    alphabet = partial["alphabet"]
+    chars = np.array([ord(c) for c in search_term], dtype=np.uint32)
+    dense = np.searchsorted(alphabet, chars)
+    if (dense >= len(alphabet)).any() or (alphabet[np.minimum(dense, len(alphabet) - 1)] != chars).any():
+        return np.array([], dtype=np.int32)
+    
+    size = len(alphabet)
+    candidates = None
+    for offset in range(len(search_term) - 2):
+        gram = (dense[offset] * size + dense[offset + 1]) * size + dense[offset + 2]
+        pos = np.searchsorted(partial["gram_codes"], gram)
+        if pos == len(partial["gram_codes"]) or partial["gram_codes"][pos] != gram:
+            return np.array([], dtype=np.int32)
+        key_ids = partial["gram_key_ids"][partial["gram_offsets"][pos]:partial["gram_offsets"][pos + 1]]
+        candidates = key_ids if candidates is None else np.intersect1d(candidates, key_ids, assume_unique=True)
+    return candidates
+
+def find_partial_codes(partial, search_term, limit, chunk_size=4096):
+    """Unique-key codes containing search_term: prefix range first, then infix matches"""
+    keys = partial["keys"]
+    lo = np.searchsorted(keys, search_term, side="left")
+    hi = np.searchsorted(keys, search_term + "\U0010ffff", side="left")
+    matched = list(partial["key_codes"][lo:min(hi, lo + limit)])
+    
+    if len(matched) < limit and len(keys):
+        if len(search_term) >= 3:
+            candidates = trigram_candidates(partial, search_term)
+        else:
+            candidates = np.arange(len(keys))
+        candidates = candidates[(candidates < lo) | (candidates >= hi)]
         
-        if matches.empty:
-            return None
+        # Verify in chunks so short, common terms stop as soon as the cap is reached
+        for start in range(0, len(candidates), chunk_size):
+            chunk = candidates[start:start + chunk_size]
+            hits = chunk[np.char.find(keys[chunk], search_term) >= 0]
+            matched.extend(partial["key_codes"][hits[:limit - len(matched)]])
+            if len(matched) >= limit:
+                break
+    
+    for key, code in zip(partial["long_keys"], partial["long_codes"]):
+        if len(matched) >= limit:
+            break
+        if search_term in key:
+            matched.append(code)
+    
+    return matched
+
+def build_status_lookup(df):
+    """Map normalized fleek_id -> latest status, first row per ID wins"""
+    if df.empty or "fleek_id" not in df.columns:
+        return pd.Series(dtype=object)
+    
+    keys = normalize_order_keys(df["fleek_id"])
+    first = keys.notna() & ~keys.duplicated()
+    
+    if "latest_status" in df.columns:
+        # Plain objects first: the column may be a categorical after compact_frame
+        status = df["latest_status"].astype(object)
+        status = status.where(status.isna(), status.astype(str).str.strip())
+        status = status.where(status.notna() & (status != ""), None)
+    else:
+        status = pd.Series(None, index=df.index, dtype=object)
+    
+    return pd.Series(status[first].to_numpy(), index=keys[first].to_numpy(), dtype=object)
+
+def lookup_live_statuses(search_terms):
+    """Join normalized search terms against the Kerry status lookup in one pass"""
+    status_data = st.session_state.all_data.get("_kerry_status_tab", {})
+    lookup = status_data.get("status_lookup")
+    
+    if lookup is None or lookup.empty:
+        return [None] * len(search_terms)
+    
+    joined = lookup.reindex(search_terms)
+    return [val if pd.notna(val) else None for val in joined]
+
+def row_live_statuses(all_data, entry, rows):
+    """Kerry status of the order on each of a source's rows (the matched order, not the typed ID)"""
+    lookup = all_data.get("_kerry_status_tab", {}).get("status_lookup")
+    if lookup is None or lookup.empty:
+        return np.full(len(rows), None, dtype=object)
+    return lookup.reindex(entry["index"]["keys"].iloc[rows]).to_numpy(dtype=object, na_value=None)
+
+# =============================================================================
+# ORDER TABLE
+# =============================================================================
+
+def text_values(series):
+    """Values as Arrow-backed "str" text formatted the way str() formats them, missing kept missing"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = pa.array(np.asarray(series.cat.categories.astype(str), dtype=object), pa.large_string())
+        codes = series.cat.codes.to_numpy()
+        text = categories.take(pa.array(codes, mask=codes < 0))
+    elif pd.api.types.is_integer_dtype(series.dtype):
+        text = pc.cast(pa.array(series, from_pandas=True), pa.large_string())
+    elif pd.api.types.is_float_dtype(series.dtype):
+        values = series.to_numpy(dtype=float, na_value=np.nan)
+        text = pc.cast(pa.array(values, from_pandas=True), pa.large_string())
+        # Arrow drops the ".0" of whole numbers and switches to exponents at other magnitudes than str()
+        whole = pc.match_substring_regex(text, r"^-?\d+$")
+        with_point = pc.binary_join_element_wise(text, pa.scalar(".0", pa.large_string()), pa.scalar("", pa.large_string()))
+        text = pc.if_else(whole, with_point, text)
+        size = np.abs(values)
+        odd = np.isinf(values) | ((size > 0) & (size < 1e-4)) | (size >= 1e16)
+        odd |= pc.fill_null(pc.match_substring(text, "e"), False).to_numpy(zero_copy_only=False)
+        if odd.any():
+            text = pc.replace_with_mask(text, pa.array(odd), pa.array([str(value) for value in values[odd]], pa.large_string()))
+    else:
+        return series.astype("str")
+    return pd.Series(pd.array(text, dtype="str"), index=series.index)
+
+def canonical_values(df, columns, rows, pseudo):
+    """First non-missing value per row across candidate columns, as text"""
+    values = None
+    for col in columns:
+        if col in pseudo:
+            candidate = pseudo[col]
+        elif col in df.columns:
+            candidate = text_values(df[col].iloc[rows].reset_index(drop=True))
+        else:
+            continue
+        values = candidate if values is None else values.fillna(candidate)
+    return values if values is not None else pd.Series(pd.NA, index=range(len(rows)), dtype="str")
+
+def order_field_values(entry, rows, live_status):
+    """Order number text and DISPLAY_FIELDS values of one source's rows, as the order table holds them.
+    
+    live_status is a categorical Series holding each row's Kerry status.
+    """
+    df = entry["df"]
+    order_number = text_values(df[entry["order_col"]].iloc[rows].reset_index(drop=True))
+    pseudo = {"Order Number": order_number, "_live_status_from_kerry": text_values(live_status)}
+    values = {label: canonical_values(df, columns, rows, pseudo) for label, columns in entry["field_columns"].items()}
+    return order_number, values
+
+def build_order_table(data):
+    """Every partner sheet's orders in one table with DISPLAY_FIELDS columns and Kerry status joined in.
+    
+    The table stays in source order (``source_bounds`` marks where each source's
+    rows start, in sheet-row order) with ``codes`` giving each row's unique key;
+    ``order`` lists its rows grouped by key (then source, then sheet row), so the
+    rows of unique key ``i`` are ``table.iloc[order[offsets[i]:offsets[i + 1]]]``.
+    """
+    start = time.perf_counter()
+    lookup = data.get("_kerry_status_tab", {}).get("status_lookup")
+    
+    sources = []
+    for source_pos, name in enumerate(DATA_SOURCES):
+        entry = data.get(name)
+        if not entry or entry.get("index") is None or entry.get("order_col") not in entry["df"].columns:
+            continue
+        rows = np.sort(entry["index"]["rows"])
+        # Text columns stay Arrow-backed "str": object columns make the concat, sort and size far slower
+        keys = entry["index"]["keys"].iloc[rows].astype("str").reset_index(drop=True)
+        sources.append((source_pos, entry, rows, keys))
+    
+    all_keys = pd.concat([keys for *_, keys in sources], ignore_index=True) if sources else pd.Series(dtype="str")
+    codes, uniques = pd.factorize(all_keys)
+    
+    # Kerry status is looked up once per distinct order, not once per sheet row
+    if lookup is not None and not lookup.empty:
+        status = pd.Categorical(lookup.reindex(uniques).to_numpy())
+    else:
+        status = pd.Categorical([None] * len(uniques))
+    
+    pieces = []
+    offset = 0
+    for source_pos, entry, rows, keys in sources:
+        piece_codes = codes[offset:offset + len(rows)]
+        offset += len(rows)
         
-        if "latest_status" in df.columns:
-            val = matches.iloc[0].get("latest_status")
-            if pd.notna(val) and str(val).strip():
-                return str(val).strip()
+        live_status = pd.Series(pd.Categorical.from_codes(status.codes[piece_codes], status.categories))
+        order_number, values = order_field_values(entry, rows, live_status)
         
-        return None
-    except:
-        return None
+        piece = {"order_key": keys, "source_pos": np.full(len(rows), source_pos, dtype=np.int8), "row": rows.astype(np.int32)}
+        piece.update(values)
+        piece["live_status"] = live_status
+        piece["order_number"] = order_number
+        pieces.append(pd.DataFrame(piece))
+    
+    if pieces:
+        table = pd.concat(pieces, ignore_index=True)
+        del pieces
+        for col in table.columns:
+            if col in CATEGORY_FIELDS:
+                table[col] = table[col].astype("category")
+            elif table[col].dtype == "str":
+                # One Arrow chunk per column: taking rows from a chunked column first joins all its chunks
+                values = pa.array(table[col])
+                if isinstance(values, pa.ChunkedArray):
+                    table[col] = pd.array(values.combine_chunks(), dtype="str")
+    else:
+        table = pd.DataFrame({
+            "order_key": pd.Series(dtype="str"),
+            "source_pos": np.empty(0, dtype=np.int8),
+            "row": np.empty(0, dtype=np.int32),
+            "live_status": pd.Series(dtype="category"),
+            "order_number": pd.Series(dtype="str"),
+        })
+    
+    # Sorting a permutation rather than the table itself avoids a random take over every text column
+    order = np.lexsort((table["row"].to_numpy(), table["source_pos"].to_numpy(), codes))
+    table.insert(1, "source", pd.Categorical.from_codes(table["source_pos"].to_numpy(), categories=list(DATA_SOURCES)))
+    offsets = np.zeros(len(uniques) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(codes, minlength=len(uniques)), out=offsets[1:])
+    
+    uniques = pd.Index(np.asarray(uniques, dtype=object), dtype=object)
+    uniques.get_indexer(uniques[:1])  # build the hash table now rather than on the first search
+    
+    return {
+        "table": table,
+        "source_bounds": np.searchsorted(table["source_pos"].to_numpy(), np.arange(len(DATA_SOURCES) + 1)),
+        "codes": codes,
+        "order": order,
+        "uniques": uniques,
+        "offsets": offsets,
+        "build_ms": (time.perf_counter() - start) * 1000,
+        "bytes": int(table.memory_usage(deep=True).sum()) + codes.nbytes + order.nbytes + offsets.nbytes,
+    }
 
-def is_valid(val):
-    if val is None:
+def same_frames(a, b):
+    """True when two data dicts hold the same loaded frames (a revalidation that changed nothing)"""
+    if a is b:
+        return True
+    if a is None or b is None or a.keys() != b.keys():
         return False
-    s = str(val).lower().strip()
-    return s not in ['', 'nan', 'none', 'n/a', '#n/a', 'na', '-', 'null', 'nat', 'not applicable']
-
-def get_field_value(data, aliases):
-    for key, val in data.items():
-        key_lower = key.lower().strip()
-        for alias in aliases:
-            if key_lower == alias.lower().strip():
-                if is_valid(val):
-                    return str(val)
-    
-    for key, val in data.items():
-        key_lower = key.lower().strip().replace(" ", "").replace("_", "")
-        for alias in aliases:
-            alias_clean = alias.lower().strip().replace(" ", "").replace("_", "")
-            if key_lower == alias_clean or alias_clean in key_lower or key_lower in alias_clean:
-                if is_valid(val):
-                    return str(val)
+    return all(a[name]["df"] is b[name]["df"] for name in a)
+
+def get_order_table(cache, data):
+    """The order table built for this data's frames, or None while it is still being built"""
+    built_for, orders = cache["orders"]
+    return orders if same_frames(built_for, data) else None
+
+def schedule_order_table(cache):
+    """Start the order table builder unless it is already running; it always picks up the latest data"""
+    with cache["orders_lock"]:
+        if cache["orders_building"]:
+            return
+        cache["orders_building"] = True
+    threading.Thread(target=order_table_builder, args=(cache,), daemon=True).start()
+
+def order_table_builder(cache):
+    """Build for the newest published data until the table matches its frames.
     
+    A progressive load publishes once per source; dicts superseded while a
+    build runs are skipped rather than queued.
+    """
+    while True:
+        with cache["orders_lock"]:
+            data = cache["data"]
+            if not data or same_frames(cache["orders"][0], data):
+                cache["orders_building"] = False
+                return
+        try:
+            orders = build_order_table(data)
+        except Exception as e:
+            with cache["orders_lock"]:
+                cache["orders_building"] = False
+            log_event("order_table_failed", error=str(e))
+            return
+        cache["orders"] = (data, orders)
+        cache["bytes"] = held_bytes(cache)
+
+def order_table_rows(orders, codes):
+    """Table row positions for unique-key codes, grouped per code in code order"""
+    codes = np.asarray(codes, dtype=np.int64)
+    starts = orders["offsets"][codes]
+    lengths = orders["offsets"][codes + 1] - starts
+    if not lengths.sum():
+        return np.empty(0, dtype=np.int64), lengths
+    positions = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+    return orders["order"][positions], lengths
+
+def source_presence(orders):
+    """Unique order key x source matrix of whether the order appears in that sheet"""
+    if "presence" not in orders:
+        presence = np.zeros((len(orders["uniques"]), len(DATA_SOURCES)), dtype=bool)
+        presence[orders["codes"], orders["table"]["source_pos"].to_numpy()] = True
+        orders["presence"] = presence
+    return orders["presence"]
+
+def overlap_matrix(orders):
+    """Orders shared by each pair of sources (the diagonal is each source's distinct orders)"""
+    presence = source_presence(orders).astype(np.int64)
+    return pd.DataFrame(presence.T @ presence, index=list(DATA_SOURCES), columns=list(DATA_SOURCES))
+
+def order_overlap(orders, sources):
+    """Table rows, from the given sources, of orders that appear in every one of them (in table order)"""
+    positions = [list(DATA_SOURCES).index(name) for name in sources]
+    shared = source_presence(orders)[:, positions].all(axis=1)
+    table = orders["table"]
+    # Rows are taken in table order: a key-ordered take over the text columns is many times slower
+    rows = shared[orders["codes"]] & np.isin(table["source_pos"].to_numpy(), positions)
+    return table.iloc[np.flatnonzero(rows)]
+
+# =============================================================================
+# TABLE TEXT SEARCH
+# =============================================================================
+
+def get_search_column(source_data, col):
+    """Lowercased text of one column, built on first use and kept with the source"""
+    cache = source_data.setdefault("search_columns", {})
+    if col not in cache:
+        cache[col] = source_data["df"][col].astype(str).str.lower()
+    return cache[col]
+
+def get_search_blob(source_data):
+    """One lowercased string per row joining every cell, built on first use and kept with the source"""
+    if "search_blob" not in source_data:
+        df = source_data["df"]
+        # Joined in Arrow: Series.str.cat over many columns is several times slower.
+        # Floats go through astype(str) so "1.0" stays "1.0" as on screen, and object
+        # columns (which may mix ints and strs) because Arrow cannot type them.
+        parts = []
+        for col in df.columns:
+            series = df[col]
+            if pd.api.types.is_float_dtype(series) or series.dtype == object:
+                values = series.astype(str)
+            else:
+                values = series
+            text = pc.cast(pa.array(values, from_pandas=True), pa.large_string())
+            parts.append(pc.fill_null(text, ""))
+        joined = pc.binary_join_element_wise(*parts, pa.scalar("\x1f", pa.large_string()))
+        source_data["search_blob"] = pd.Series(pd.array(pc.utf8_lower(joined), dtype="str"), index=df.index)
+    return source_data["search_blob"]
+
+def filter_table_text(source_data, display_df, filter_text, columns=None):
+    """Rows of display_df with a cell containing filter_text (case-insensitive, literal)"""
+    term = filter_text.lower()
+    if columns:
+        hits = None
+        for col in columns:
+            col_hits = get_search_column(source_data, col).str.contains(term, na=False, regex=False)
+            hits = col_hits if hits is None else hits | col_hits
+    else:
+        hits = get_search_blob(source_data).str.contains(term, na=False, regex=False)
+    
+    if len(display_df) < len(hits):
+        hits = hits.loc[display_df.index]
+    return display_df[hits.to_numpy()]
+
+# =============================================================================
+# TABLE PAGING
+# =============================================================================
+
+def get_sort_order(source_data, col, ascending=True):
+    """Row positions of the whole source sorted by col (blanks last), built on first use and kept with the source"""
+    cache = source_data.setdefault("sort_orders", {})
+    if (col, ascending) not in cache:
+        values = source_data["df"][col].reset_index(drop=True)
+        # Object columns may mix ints and strs, which do not compare; sort those as text
+        key = (lambda s: s.astype(str)) if values.dtype == object else None
+        cache[(col, ascending)] = values.sort_values(ascending=ascending, kind="stable", na_position="last", key=key).index.to_numpy()
+    return cache[(col, ascending)]
+
+def table_rows(source_data, display_df, sort_col=None, ascending=True):
+    """Row positions of display_df (a row subset of the source frame) in display order"""
+    rows = display_df.index.to_numpy()
+    if not sort_col:
+        return rows
+    
+    # Keep the source-wide order for the rows still shown rather than re-sorting them
+    order = get_sort_order(source_data, sort_col, ascending)
+    if len(rows) == len(order):
+        return order
+    shown = np.zeros(len(order), dtype=bool)
+    shown[rows] = True
+    return order[shown[order]]
+
+def arrow_payload_bytes(df):
+    """Size of df serialized as an Arrow IPC stream, which is how st.dataframe ships it"""
+    # Arrow cannot type object columns mixing ints and strs; st.dataframe sends those as text too
+    objects = df.columns[df.dtypes == object]
+    if len(objects):
+        df = df.astype({col: str for col in objects})
+    table = pa.Table.from_pandas(df)
+    sink = pa.MockOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.size()
+
+# =============================================================================
+# EXPORT
+# =============================================================================
+
+def export_bytes(df, fmt):
+    """Serialize a frame in one of EXPORT_FORMATS"""
+    if fmt == "Parquet":
+        buffer = BytesIO()
+        to_parquet_safe(df, buffer)
+        return buffer.getvalue()
+    data = df.to_csv(index=False).encode("utf-8")
+    if fmt == "CSV (gzip)":
+        # Level 1 is ~5x faster than the default for a few percent larger files
+        return gzip.compress(data, compresslevel=1, mtime=0)
+    return data
+
+@st.cache_resource
+def get_export_cache():
+    """Process-wide LRU of generated download files, bounded by EXPORT_CACHE_MB"""
+    return {"lock": threading.Lock(), "entries": collections.OrderedDict(), "bytes": 0}
+
+def cached_export(key, fmt, build_frame):
+    """Export file for key, which must change whenever build_frame would return different rows.
+    
+    Keys carry the data version, so a reload never serves a stale file.
+    """
+    cache = get_export_cache()
+    limit = EXPORT_CACHE_MB * 1024 * 1024
+    with cache["lock"]:
+        data = cache["entries"].get((key, fmt))
+        if data is not None:
+            cache["entries"].move_to_end((key, fmt))
+            return data
+    
+    data = export_bytes(build_frame(), fmt)
+    with cache["lock"]:
+        if (key, fmt) not in cache["entries"] and len(data) <= limit:
+            cache["entries"][(key, fmt)] = data
+            cache["bytes"] += len(data)
+            while cache["bytes"] > limit:
+                _, evicted = cache["entries"].popitem(last=False)
+                cache["bytes"] -= len(evicted)
+    return data
+
+def search_results_frame(results, all_data):
+    """All search results as one table: result details followed by the matched source row.
+    
+    all_data is passed in because download callables run outside the script thread,
+    where st.session_state is not this session's.
+    """
+    frames = []
+    for source_name, group in results.groupby("source", sort=False):
+        rows = all_data[source_name]["df"].iloc[group["row"].to_numpy()].reset_index(drop=True)
+        details = pd.DataFrame({
+            "Source": source_name,
+            "Searched ID": group["order_id"].to_numpy(),
+            "Live Status": group["live_status"].to_numpy(),
+        })
+        frames.append(pd.concat([details, rows.drop(columns=details.columns, errors="ignore")], axis=1))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+def export_buttons(key, build_frame, file_stem, widget_key):
+    """Format picker plus a download button that builds the file only when clicked"""
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        fmt = st.selectbox("Format", list(EXPORT_FORMATS), key=f"export_format_{widget_key}", label_visibility="collapsed")
+    with col2:
+        st.download_button(
+            f"📥 Download {fmt}",
+            lambda: cached_export(key, fmt, build_frame),
+            f"{file_stem}_{datetime.now().strftime('%Y%m%d')}.{EXPORT_FORMATS[fmt]['extension']}",
+            EXPORT_FORMATS[fmt]["mime"],
+            key=f"download_{widget_key}",
+        )
+
+# =============================================================================
+# COLUMN COMPACTION
+# =============================================================================
+
+# DISPLAY_FIELDS whose columns are stored as categoricals / downcast numerics after load
+CATEGORY_FIELDS = ["Latest Status", "Service", "QC Status", "Courier", "Destination"]
+NUMERIC_FIELDS = ["Boxes", "Weight (kg)"]
+
+def get_display_field(label):
+    for fields in DISPLAY_FIELDS.values():
+        for field in fields:
+            if field["label"] == label:
+                return field
     return None
 
+def find_alias_columns(columns, aliases):
+    """Columns matching an alias list: exact (case-insensitive) matches first, then fuzzy ones"""
+    exact_aliases = [alias.lower().strip() for alias in aliases]
+    fuzzy_aliases = [alias.replace(" ", "").replace("_", "") for alias in exact_aliases]
+    
+    exact, fuzzy = [], []
+    for col in columns:
+        col_lower = str(col).lower().strip()
+        col_clean = col_lower.replace(" ", "").replace("_", "")
+        if col_lower in exact_aliases:
+            exact.append(col)
+        elif any(col_clean == alias or alias in col_clean or col_clean in alias for alias in fuzzy_aliases):
+            fuzzy.append(col)
+    return exact + fuzzy
+
+# Cell values (compared lowercased and stripped) that mean "no value" in the sheets
+INVALID_VALUES = ['', 'nan', 'none', 'n/a', '#n/a', 'na', '-', 'null', 'nat', 'not applicable']
+
+def clean_sentinels(df):
+    """Turn placeholder cells ("#N/A", "-", "Not Applicable", ...) into missing values, in place.
+    
+    Runs once per load so lookups, stats and the table filter only check for
+    missing values. Returns the number of cells cleaned per column.
+    """
+    invalid = pa.array(INVALID_VALUES, pa.large_string())
+    counts = {}
+    for col in df.columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            categories = series.cat.categories
+            bad = categories[pd.Index(categories.astype(str)).str.lower().str.strip().isin(INVALID_VALUES)]
+            if len(bad):
+                counts[col] = int(series.isin(bad).sum())
+                df[col] = series.cat.remove_categories(bad)
+            continue
+        if not (pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)):
+            continue
+        text = pa.array(series.astype("str"), from_pandas=True)
+        mask = pc.fill_null(pc.is_in(pc.utf8_lower(pc.utf8_trim_whitespace(text)), value_set=invalid), False)
+        cleaned = pc.sum(mask).as_py() or 0
+        if cleaned:
+            counts[col] = cleaned
+            df[col] = series.mask(mask.to_numpy(zero_copy_only=False))
+    return counts
+
+def compact_frame(df, order_col=None):
+    """Store low-cardinality text columns as categoricals and downcast integer columns.
+    
+    Only conversions that keep every displayed value identical are applied:
+    numbers are converted only when every non-empty cell parses, and floats
+    keep float64 so weights render exactly as in the sheet.
+    """
+    before = int(df.memory_usage(deep=True).sum())
+    
+    for label in CATEGORY_FIELDS:
+        for col in find_alias_columns(df.columns, get_display_field(label)["aliases"]):
+            series = df[col]
+            if col == order_col or isinstance(series.dtype, pd.CategoricalDtype):
+                continue
+            if not (pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)):
+                continue
+            if series.nunique() <= len(series) * 0.5:
+                df[col] = series.astype("category")
+    
+    for label in NUMERIC_FIELDS:
+        for col in find_alias_columns(df.columns, get_display_field(label)["aliases"]):
+            series = df[col]
+            if col == order_col or isinstance(series.dtype, pd.CategoricalDtype) or pd.api.types.is_bool_dtype(series):
+                continue
+            numeric = series if pd.api.types.is_numeric_dtype(series) else pd.to_numeric(series, errors="coerce")
+            if numeric.isna().sum() != series.isna().sum():
+                continue
+            if numeric.notna().all() and (numeric % 1 == 0).all():
+                df[col] = pd.to_numeric(numeric.astype(np.int64), downcast="integer")
+            elif numeric.dtype != series.dtype:
+                df[col] = numeric.astype(np.float64)
+    
+    after = int(df.memory_usage(deep=True).sum())
+    return df, {"before": before, "after": after}
+
+# =============================================================================
+# HELPER FUNCTIONS
+# =============================================================================
+
+def get_latest_status_from_kerry(order_id):
+    try:
+        return lookup_live_statuses([str(order_id).lower().strip()])[0]
+    except:
+        return None
+
+def resolve_field_columns(columns):
+    """Map each DISPLAY_FIELDS label to the columns its value is read from, in priority order.
+    
+    Besides the sheet's own columns, the order table supplies "Order Number" and
+    the Kerry "_live_status_from_kerry" status.
+    """
+    keys = list(columns) + [key for key in ["Order Number", "_live_status_from_kerry"] if key not in columns]
+    return {
+        field["label"]: find_alias_columns(keys, field["aliases"])
+        for fields in DISPLAY_FIELDS.values()
+        for field in fields
+    }
+
 def get_partner_counts():
     counts = {"ECL": 0, "GE": 0, "APX": 0, "Kerry": 0}
     for name, data in st.session_state.all_data.items():
@@ -423,16 +1652,19 @@ def find_date_column(df):
     
     return None
 
-def smart_parse_date(date_series):
-    """Smart date parsing with multiple format attempts"""
-    if date_series.empty:
-        return pd.Series(dtype='datetime64[ns]')
+def sniff_date_format(date_series, sample_size=1000):
+    """Decide which parse smart_parse_date should run, judged on an evenly spaced sample.
+    
+    Returns a strptime format, or None for pandas auto-detection with dayfirst.
+    """
+    if len(date_series) > sample_size:
+        date_series = date_series.iloc[np.linspace(0, len(date_series) - 1, sample_size).astype(int)]
     
     # Try pandas auto-detect first
     try:
         parsed = pd.to_datetime(date_series, errors='coerce', dayfirst=True)
         if parsed.notna().sum() > len(date_series) * 0.5:  # At least 50% success
-            return parsed
+            return None
     except:
         pass
     
@@ -452,24 +1684,84 @@ def smart_parse_date(date_series):
         try:
             parsed = pd.to_datetime(date_series, format=fmt, errors='coerce')
             if parsed.notna().sum() > len(date_series) * 0.3:  # At least 30% success
-                return parsed
+                return fmt
         except:
             continue
     
     # Last resort: coerce
+    return None
+
+def smart_parse_date(date_series):
+    """Smart date parsing: sniff the format on a sample, then parse the full column once"""
+    if date_series.empty:
+        return pd.Series(dtype='datetime64[ns]')
+    
+    fmt = sniff_date_format(date_series)
+    try:
+        if fmt is not None:
+            return pd.to_datetime(date_series, format=fmt, errors='coerce')
+    except:
+        pass
     return pd.to_datetime(date_series, errors='coerce', dayfirst=True)
 
-def calculate_stats(df, source_name):
-    """Calculate boxes and weight stats for a dataframe"""
-    total_boxes = 0
-    total_weight = 0.0
+def parse_source_dates(df):
+    """Detect and parse a source's date column once per load"""
+    date_col = find_date_column(df)
+    if date_col is None:
+        return {"date_col": None, "parsed_dates": None, "date_range": None, "date_index": None}
     
+    parsed_dates = smart_parse_date(df[date_col])
+    valid_dates = parsed_dates.dropna()
+    date_range = (valid_dates.min().date(), valid_dates.max().date()) if len(valid_dates) else None
+    return {
+        "date_col": date_col,
+        "parsed_dates": parsed_dates,
+        "date_range": date_range,
+        "date_index": build_date_index(parsed_dates),
+    }
+
+def build_date_index(parsed_dates):
+    """Dates sorted ascending with the row position each came from, for binary-search filtering"""
+    if not pd.api.types.is_datetime64_any_dtype(parsed_dates):
+        return None
+    
+    rows = np.flatnonzero(parsed_dates.notna().to_numpy())
+    values = parsed_dates.to_numpy()[rows]
+    order = np.argsort(values, kind="stable")
+    return {
+        "dates": pd.DatetimeIndex(values[order]),
+        "rows": rows[order],
+        "in_row_order": bool((np.diff(order) > 0).all()),
+    }
+
+def filter_by_date(source_data, start, end):
+    """Rows of a source dated within [start, end], without scanning or copying the whole frame"""
+    df = source_data["df"]
+    date_index = source_data.get("date_index")
+    
+    if date_index is None:
+        parsed_dates = source_data["parsed_dates"]
+        return df[(parsed_dates >= start) & (parsed_dates <= end)]
+    
+    lo = date_index["dates"].searchsorted(start, side="left")
+    hi = date_index["dates"].searchsorted(end, side="right")
+    rows = date_index["rows"][lo:hi]
+    if len(rows) == len(df):
+        return df
+    
+    # Sheets appended in date order: the matching rows are one contiguous slice
+    if date_index["in_row_order"] and (len(rows) == 0 or rows[-1] - rows[0] + 1 == len(rows)):
+        return df.iloc[rows[0]:rows[-1] + 1] if len(rows) else df.iloc[0:0]
+    return df.iloc[np.sort(rows)]
+
+def find_stats_columns(columns):
+    """Pick the box and weight columns summed into a source's daily totals"""
     box_aliases = ["box_count", "boxes", "box count", "no of boxes", "n.o of boxes", "no. of boxes", "boxcount", "total_boxes", "box"]
     weight_aliases = ["weight_kgs", "weight (kg)", "weight", "order net weight", "chargeable weight", "order's net weight (kg)", "weight_kg", "total_weight", "net_weight", "gross_weight", "wt", "wt (kg)", "net weight"]
     
     # Find box column
     box_col = None
-    for col in df.columns:
+    for col in columns:
         col_lower = col.lower().strip()
         for alias in box_aliases:
             if alias.lower() == col_lower or alias.lower() in col_lower:
@@ -480,7 +1772,7 @@ def calculate_stats(df, source_name):
     
     # Find weight column
     weight_col = None
-    for col in df.columns:
+    for col in columns:
         col_lower = col.lower().strip()
         for alias in weight_aliases:
             if alias.lower() == col_lower or alias.lower() in col_lower:
@@ -489,119 +1781,504 @@ def calculate_stats(df, source_name):
         if weight_col:
             break
     
-    if box_col:
-        try:
-            total_boxes = pd.to_numeric(df[box_col], errors='coerce').sum()
-            if pd.isna(total_boxes):
-                total_boxes = 0
-        except:
-            total_boxes = 0
+    return box_col, weight_col
+
+def stats_values(df, col):
+    """A box/weight column as floats, with blanks and text counted as zero"""
+    if not col:
+        return np.zeros(len(df))
+    try:
+        return pd.to_numeric(df[col], errors='coerce').fillna(0).to_numpy(dtype=float)
+    except:
+        return np.zeros(len(df))
+
+def build_daily_totals(df, parsed_dates, stats_columns):
+    """Orders, boxes and weight per day plus running totals, built once per source load.
     
-    if weight_col:
-        try:
-            total_weight = pd.to_numeric(df[weight_col], errors='coerce').sum()
-            if pd.isna(total_weight):
-                total_weight = 0.0
-        except:
-            total_weight = 0.0
+    Any date range then sums as the difference of two running totals.
+    """
+    box_col, weight_col = stats_columns
+    values = pd.DataFrame({
+        "orders": np.ones(len(df)),
+        "boxes": stats_values(df, box_col),
+        "weight": stats_values(df, weight_col),
+    })
+    totals = values.sum().to_dict()
     
-    return int(total_boxes), round(total_weight, 2)
+    if parsed_dates is None or not pd.api.types.is_datetime64_any_dtype(parsed_dates):
+        return {"totals": totals, "daily": None, "cumulative": None}
+    
+    # Rows without a date are dropped by the groupby, just as the date filter drops them
+    daily = values.groupby(parsed_dates.dt.normalize().to_numpy()).sum()
+    daily.index = pd.DatetimeIndex(daily.index, name="day")
+    cumulative = np.vstack([np.zeros((1, 3)), daily.to_numpy().cumsum(axis=0)])
+    return {"totals": totals, "daily": daily, "cumulative": cumulative}
+
+def get_range_stats(source_data, start=None, end=None):
+    """Orders, boxes and weight for a source, optionally only rows dated within [start, end]"""
+    daily_totals = source_data["daily_totals"]
+    if start is None or daily_totals["daily"] is None:
+        totals = daily_totals["totals"]
+        orders, boxes, weight = totals["orders"], totals["boxes"], totals["weight"]
+    else:
+        days = daily_totals["daily"].index
+        lo = days.searchsorted(pd.Timestamp(start).normalize(), side="left")
+        hi = days.searchsorted(pd.Timestamp(end), side="right")
+        orders, boxes, weight = daily_totals["cumulative"][hi] - daily_totals["cumulative"][lo]
+    return int(round(orders)), int(round(boxes)), round(float(weight), 2)
 
 # =============================================================================
 # SEARCH FUNCTION
 # =============================================================================
 
-def instant_search(order_ids):
-    results = []
+RESULT_COLUMNS = ["source", "partner", "type", "icon", "order_id", "query_key", "order_number", "live_status", "row"]
+
+def find_partial_rows(index, search_term, limit=None):
+    """Row positions whose order key contains search_term, capped at limit rows"""
+    limit = PARTIAL_MATCH_LIMIT if limit is None else limit
+    codes = find_partial_codes(index["partial"], search_term, limit)
+    return index_rows(index, codes)[:limit]
+
+def batch_search(order_ids, partial=True):
+    """Search all sources for every order ID at once and return one tidy results frame.
     
+    Exact matches are one probe of the order table, or of each source's own
+    index while the table is still being built; a source without an exact
+    match falls back to partial matching on its index unless partial is False.
+    Each result row points back at its source row via ``row`` and carries that
+    order's Kerry ``live_status``; use result_field_values() for only the rows
+    being shown.
+    Step timings are left in ``results.attrs["timings"]``.
+    """
+    timings = {}
+    queries = {}
     for order_id in order_ids:
         search_term = str(order_id).lower().strip()
-        if not search_term:
-            continue
-        
-        for source_name, source_data in st.session_state.all_data.items():
-            if source_name == "_kerry_status_tab":
+        if search_term and search_term not in queries:
+            queries[search_term] = order_id
+    
+    if not queries:
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+    
+    query_df = pd.DataFrame({
+        "query_key": list(queries.keys()),
+        "order_id": list(queries.values()),
+    })
+    query_df["query_pos"] = np.arange(len(query_df))
+    
+    started = time.perf_counter()
+    all_data = st.session_state.all_data
+    orders = get_order_table(get_data_cache(), all_data)
+    timings["table_ms"] = (time.perf_counter() - started) * 1000
+    
+    started = time.perf_counter()
+    frames = []
+    exact_pairs = set()
+    if orders is not None:
+        codes = orders["uniques"].get_indexer(query_df["query_key"])
+        found = np.flatnonzero(codes >= 0)
+        positions, lengths = order_table_rows(orders, codes[found])
+        table = orders["table"]
+        frames = [pd.DataFrame({
+            "source_pos": table["source_pos"].to_numpy(dtype=np.int64)[positions],
+            "query_pos": np.repeat(found, lengths),
+            "order_number": table["order_number"].iloc[positions].to_numpy(),
+            "live_status": table["live_status"].iloc[positions].to_numpy(dtype=object, na_value=None),
+            "row": table["row"].to_numpy(dtype=np.int64)[positions],
+        })]
+        exact_pairs = set(zip(frames[0]["query_pos"], frames[0]["source_pos"]))
+    
+    # Per-source probes: exact matches while the table is not built, partial ones for pairs still without a hit
+    if partial or orders is None:
+        for source_pos, source_name in enumerate(DATA_SOURCES):
+            source_data = all_data.get(source_name, {})
+            df = source_data.get("df", pd.DataFrame())
+            order_col = source_data.get("order_col")
+            index = source_data.get("index")
+            
+            if df.empty or order_col is None or order_col not in df.columns or index is None:
                 continue
             
-            try:
-                df = source_data.get("df", pd.DataFrame())
-                order_col = source_data.get("order_col")
-                
-                if df.empty or order_col is None or order_col not in df.columns:
+            hit_pos, hit_rows = [], []
+            codes = index["uniques"].get_indexer(list(queries)) if orders is None else None
+            for query_pos, search_term in enumerate(queries):
+                if codes is not None and codes[query_pos] >= 0:
+                    rows = index_rows(index, [codes[query_pos]])
+                elif partial and (query_pos, source_pos) not in exact_pairs:
+                    rows = find_partial_rows(index, search_term)
+                else:
                     continue
-                
-                df_search = df[order_col].astype(str).str.lower().str.strip()
-                matches = df[df_search == search_term]
-                
-                if matches.empty:
-                    matches = df[df_search.str.contains(search_term, na=False, regex=False)]
-                
-                for _, row in matches.iterrows():
-                    config = DATA_SOURCES[source_name]
-                    row_data = row.to_dict()
-                    
-                    order_value = row.get(order_col)
-                    if pd.notna(order_value):
-                        row_data["Order Number"] = str(order_value)
-                    
-                    live_status = get_latest_status_from_kerry(order_id)
-                    if live_status:
-                        row_data["_live_status_from_kerry"] = live_status
-                    
-                    results.append({
-                        "source": source_name,
-                        "partner": config["partner"],
-                        "type": config["type"],
-                        "icon": config["icon"],
-                        "order_id": order_id,
-                        "data": row_data
-                    })
-            except:
+                if len(rows):
+                    hit_pos.append(np.full(len(rows), query_pos))
+                    hit_rows.append(rows)
+            
+            if not hit_rows:
                 continue
+            
+            rows = np.concatenate(hit_rows)
+            order_values = df[order_col].iloc[rows]
+            frames.append(pd.DataFrame({
+                "source_pos": source_pos,
+                "query_pos": np.concatenate(hit_pos),
+                "order_number": order_values.astype(str).where(order_values.notna(), None).to_numpy(dtype=object),
+                "live_status": row_live_statuses(all_data, source_data, rows),
+                "row": rows,
+            }))
+    timings["lookup_ms"] = (time.perf_counter() - started) * 1000
     
+    started = time.perf_counter()
+    if not frames:
+        frames = [pd.DataFrame({
+            "source_pos": np.empty(0, dtype=np.int64),
+            "query_pos": np.empty(0, dtype=np.int64),
+            "order_number": np.empty(0, dtype=object),
+            "live_status": np.empty(0, dtype=object),
+            "row": np.empty(0, dtype=np.int64),
+        })]
+    results = pd.concat(frames, ignore_index=True).sort_values(["query_pos", "source_pos", "row"], kind="stable")
+    results = results.merge(query_df, on="query_pos", how="left")
+    sources = pd.DataFrame.from_dict(DATA_SOURCES, orient="index")[["partner", "type", "icon"]]
+    sources["source"] = sources.index
+    sources["source_pos"] = np.arange(len(sources))
+    results = results.merge(sources, on="source_pos", how="left")
+    results = results[RESULT_COLUMNS].reset_index(drop=True)
+    timings["merge_ms"] = (time.perf_counter() - started) * 1000
+    results.attrs["timings"] = timings
     return results
 
+@st.cache_resource
+def get_search_cache():
+    """Process-wide LRU of batch_search results, shared by every session"""
+    return {
+        "lock": threading.Lock(),
+        "entries": collections.OrderedDict(),
+        "version": None,
+        "bytes": 0,
+        "hits": 0,
+        "misses": 0,
+        "evictions": 0,
+    }
+
+def cached_batch_search(order_ids, partial=True):
+    """batch_search through the search cache.
+    
+    Entries are keyed by the set of normalized IDs and the data version, so
+    the same IDs in another order or case hit, and a reload never serves old
+    results. A hit is returned in this call's ID order with its typed IDs.
+    """
+    started = time.perf_counter()
+    queries = {}
+    for order_id in order_ids:
+        search_term = str(order_id).lower().strip()
+        if search_term and search_term not in queries:
+            queries[search_term] = order_id
+    
+    cache = get_search_cache()
+    version = st.session_state.data_version
+    key = (version, partial, tuple(sorted(queries)))
+    with cache["lock"]:
+        if cache["version"] != version:
+            cache["entries"].clear()
+            cache["bytes"] = 0
+            cache["version"] = version
+        entry = cache["entries"].get(key)
+        results = entry[0] if entry else None
+        if entry:
+            cache["entries"].move_to_end(key)
+            cache["hits"] += 1
+        else:
+            cache["misses"] += 1
+    
+    if results is None:
+        results = batch_search(list(queries.values()), partial=partial)
+        size = int(results.memory_usage(deep=True).sum())
+        with cache["lock"]:
+            if cache["version"] == version and key not in cache["entries"] and size <= SEARCH_CACHE_MB * 1024 * 1024:
+                cache["entries"][key] = (results, size)
+                cache["bytes"] += size
+                while cache["bytes"] > SEARCH_CACHE_MB * 1024 * 1024:
+                    _, (_, evicted) = cache["entries"].popitem(last=False)
+                    cache["bytes"] -= evicted
+                    cache["evictions"] += 1
+        return results
+    
+    positions = {search_term: i for i, search_term in enumerate(queries)}
+    order = np.argsort(results["query_key"].map(positions).to_numpy(), kind="stable")
+    hit = results.iloc[order].reset_index(drop=True)
+    hit["order_id"] = hit["query_key"].map(queries)
+    hit.attrs = {"timings": {"cache_ms": (time.perf_counter() - started) * 1000}}
+    return hit
+
+def result_field_values(results):
+    """DISPLAY_FIELDS values of the given result rows, read from the order table (same index as results)"""
+    orders = get_order_table(get_data_cache(), st.session_state.all_data)
+    if orders is None:
+        return source_field_values(results)
+    table = orders["table"]
+    table_rows = table["row"].to_numpy()
+    source_pos = results["source"].map({name: i for i, name in enumerate(DATA_SOURCES)}).to_numpy()
+    rows = results["row"].to_numpy()
+    
+    positions = np.empty(len(results), dtype=np.int64)
+    for pos in np.unique(source_pos):
+        start, end = orders["source_bounds"][pos], orders["source_bounds"][pos + 1]
+        mask = source_pos == pos
+        positions[mask] = start + np.searchsorted(table_rows[start:end], rows[mask])
+    
+    labels = [field["label"] for fields in DISPLAY_FIELDS.values() for field in fields]
+    values = table.iloc[positions].reindex(columns=labels)
+    values.index = results.index
+    return values
+
+def source_field_values(results):
+    """result_field_values read from each source's own rows, for while the order table is being built"""
+    all_data = st.session_state.all_data
+    labels = [field["label"] for fields in DISPLAY_FIELDS.values() for field in fields]
+    
+    frames = []
+    for source_name, group in results.groupby("source", sort=False):
+        entry = all_data[source_name]
+        rows = group["row"].to_numpy()
+        status = pd.Categorical(row_live_statuses(all_data, entry, rows))
+        _, values = order_field_values(entry, rows, pd.Series(status))
+        frames.append(pd.DataFrame(values, columns=labels).set_axis(group.index))
+    
+    if not frames:
+        return pd.DataFrame(columns=labels, index=results.index)
+    return pd.concat(frames).reindex(results.index)
+
 # =============================================================================
-# UI COMPONENTS
+# BULK SEARCH
 # =============================================================================
 
-def render_result_card(result):
-    partner = result["partner"]
-    source_name = result["source"]
-    icon = result["icon"]
-    data = result["data"]
-    order_id = result["order_id"]
+def read_id_file(uploaded):
+    """Uploaded CSV / XLSX of order IDs as text columns; a file without a header row is read as one"""
+    def read(header):
+        uploaded.seek(0)
+        if uploaded.name.lower().endswith(".xlsx"):
+            return pd.read_excel(uploaded, dtype=str, header=header)
+        return pd.read_csv(uploaded, dtype=str, header=header, skip_blank_lines=True)
     
-    st.markdown(f"""
-    <div class="result-card result-card-{partner.lower()}">
-        <div class="result-partner result-partner-{partner.lower()}">{icon} {partner}</div>
-        <div class="result-source">{source_name}</div>
-        <div class="result-order">Order: {order_id}</div>
-    </div>
-    """, unsafe_allow_html=True)
+    df = read(0)
+    if find_alias_columns(df.columns, get_display_field("Order Number")["aliases"]):
+        return df
+    # No order-number-like header: the first row is data
+    df = read(None)
+    df.columns = [f"Column {i + 1}" for i in range(len(df.columns))]
+    return df
+
+def bulk_order_ids(df, column):
+    """Distinct non-blank IDs of one column, in file order"""
+    ids = df[column].dropna().astype(str).str.strip()
+    return pd.unique(ids[ids != ""]).tolist()
+
+def bulk_result_columns():
+    """Fixed header of the bulk result file: search_results_frame's columns across every loaded source"""
+    columns = ["Source", "Searched ID", "Live Status"]
+    for name in DATA_SOURCES:
+        if name in st.session_state.all_data:
+            columns += [col for col in st.session_state.all_data[name]["df"].columns if col not in columns]
+    return columns
+
+def run_bulk_search(order_ids, partial=False, on_progress=None):
+    """Search order_ids BULK_CHUNK_SIZE at a time, appending each chunk's matches to a gzip CSV.
+    
+    Only the compressed file and the unmatched IDs outlive a chunk.
+    on_progress(done, total, matches, seconds) is called after every chunk.
+    """
+    started = time.perf_counter()
+    all_data = st.session_state.all_data
+    columns = bulk_result_columns()
+    missing = []
+    matches = 0
+    buffer = BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode="wb", compresslevel=1, mtime=0) as out:
+        out.write(pd.DataFrame(columns=columns).to_csv(index=False).encode("utf-8"))
+        for start in range(0, len(order_ids), BULK_CHUNK_SIZE):
+            chunk = order_ids[start:start + BULK_CHUNK_SIZE]
+            results = batch_search(chunk, partial=partial)
+            if not results.empty:
+                frame = search_results_frame(results, all_data).reindex(columns=columns)
+                out.write(frame.to_csv(index=False, header=False).encode("utf-8"))
+                matches += len(results)
+            found = set(results["query_key"])
+            missing += [order_id for order_id in chunk if str(order_id).lower().strip() not in found]
+            if on_progress:
+                on_progress(start + len(chunk), len(order_ids), matches, time.perf_counter() - started)
     
+    seconds = time.perf_counter() - started
+    summary = {
+        "ids": len(order_ids),
+        "matched": len(order_ids) - len(missing),
+        "results": matches,
+        "seconds": seconds,
+        "ids_per_second": len(order_ids) / seconds if seconds else 0.0,
+    }
+    log_event("bulk_search", **{key: round(value, 1) for key, value in summary.items()})
+    return buffer.getvalue(), missing, summary
+
+# =============================================================================
+# UI COMPONENTS
+# =============================================================================
+
+FIELD_VALUE_CLASSES = {
+    "highlight": "field-value-highlight",
+    "tracking": "field-value-tracking",
+    "status": "field-value-status",
+}
+
+def result_card_html(result, values):
+    """One result card (header plus every DISPLAY_FIELDS section) as a single line of HTML"""
+    partner = html.escape(result.partner.lower())
+    sections = []
     for section_name, fields in DISPLAY_FIELDS.items():
-        st.markdown(f"<div class='section-title'>{section_name}</div>", unsafe_allow_html=True)
-        
-        cols = st.columns(2)
-        for i, field in enumerate(fields):
-            value = get_field_value(data, field["aliases"])
-            with cols[i % 2]:
-                st.markdown(f"<div class='field-label'>{field['label']}</div>", unsafe_allow_html=True)
-                if value:
-                    css_class = {
-                        "highlight": "field-value-highlight",
-                        "tracking": "field-value-tracking", 
-                        "status": "field-value-status"
-                    }.get(field["type"], "")
-                    if field["type"] == "status":
-                        st.markdown(f"<div class='field-value {css_class}'>📡 {value}</div>", unsafe_allow_html=True)
-                    else:
-                        st.markdown(f"<div class='field-value {css_class}'>{value}</div>", unsafe_allow_html=True)
-                else:
-                    st.markdown("<div class='field-value field-value-empty'>—</div>", unsafe_allow_html=True)
+        cells = []
+        for field in fields:
+            value = values[field["label"]]
+            if pd.isna(value):
+                cell = "<div class='field-value field-value-empty'>—</div>"
+            else:
+                prefix = "📡 " if field["type"] == "status" else ""
+                css_class = FIELD_VALUE_CLASSES.get(field["type"], "")
+                cell = f"<div class='field-value {css_class}'>{prefix}{html.escape(str(value))}</div>"
+            cells.append(f"<div><div class='field-label'>{field['label']}</div>{cell}</div>")
+        sections.append(f"<div class='section-title'>{section_name}</div><div class='field-grid'>{''.join(cells)}</div>")
     
-    st.markdown("---")
+    return (
+        f"<div class='result-card result-card-{partner}'>"
+        f"<div class='result-partner result-partner-{partner}'>{result.icon} {html.escape(result.partner)}</div>"
+        f"<div class='result-source'>{html.escape(result.source)}</div>"
+        f"<div class='result-order'>Order: {html.escape(str(result.order_id))}</div>"
+        f"{''.join(sections)}</div>"
+    )
+
+def render_search_results(results):
+    """Paged search results as cards (one markdown block per page) or a compact table.
+    
+    Returns the time spent building and sending the page, in ms.
+    """
+    cards_default = len(results) <= RESULT_CARD_VIEW_MAX
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        view = st.radio(
+            "View",
+            ["🗂️ Cards", "📋 Table"],
+            index=0 if cards_default else 1,
+            horizontal=True,
+            label_visibility="collapsed",
+            # Large result sets open in the table view; a smaller search gets the cards again
+            key=f"results_view_{cards_default}"
+        )
+    cards = view == "🗂️ Cards"
+    with col2:
+        page_size = st.selectbox(
+            "Per page",
+            RESULT_PAGE_SIZES if cards else TABLE_PAGE_SIZES,
+            key=f"results_page_size_{cards}"
+        )
+    page_count = max(1, -(-len(results) // page_size))
+    if st.session_state.get("results_page", 1) > page_count:
+        st.session_state["results_page"] = page_count
+    with col3:
+        page = st.number_input(f"Page (of {page_count:,})", min_value=1, max_value=page_count, step=1, key="results_page")
+    
+    render_start = time.perf_counter()
+    page_results = results.iloc[(page - 1) * page_size:page * page_size]
+    values = result_field_values(page_results)
+    if cards:
+        html_block = "".join(
+            result_card_html(result, row_values)
+            for result, (_, row_values) in zip(page_results.itertuples(index=False), values.iterrows())
+        )
+        st.markdown(html_block, unsafe_allow_html=True)
+    else:
+        table = pd.concat([
+            page_results[["source", "order_id"]].rename(columns={"source": "Source", "order_id": "Searched ID"}),
+            values,
+        ], axis=1)
+        st.dataframe(table, use_container_width=True, hide_index=True)
+    st.caption(f"Results {(page - 1) * page_size + 1:,}–{(page - 1) * page_size + len(page_results):,} of {len(results):,}")
+    return (time.perf_counter() - render_start) * 1000
+
+def source_status_line(name, entry, loading_since=None):
+    """One sidebar line with a source's load state, size and latency"""
+    label = "📡 Kerry Status Tab" if name == "_kerry_status_tab" else f"{DATA_SOURCES[name]['icon']} {name}"
+    if entry is None:
+        waited = time.time() - loading_since if loading_since else 0
+        return f"{label}: ⏳ loading {waited:.0f}s"
+    
+    state = "❌" if entry.get("error") else "✅"
+    line = f"{label}: {state} {len(entry['df']):,} rows"
+    if entry.get("load_seconds") is not None:
+        line += f" | {entry['load_seconds']:.1f}s {entry.get('outcome', '')}"
+    return line
+
+def render_admin_panel():
+    """Load, search and rerun timings for sizing the container and spotting a regressed sheet"""
+    cache = get_data_cache()
+    st.caption(
+        f"Shared cache: {cache['hits']:,} hits | {cache['misses']:,} misses | "
+        f"{cache['bytes'] / 1024 / 1024:.1f} MB held"
+    )
+    for name, d in st.session_state.all_data.items():
+        label = "Kerry Status Tab" if name == "_kerry_status_tab" else name
+        memory = d["memory"]
+        line = f"{label}: {memory['before'] / 1024 / 1024:.1f} → {memory['after'] / 1024 / 1024:.1f} MB"
+        index = d.get("index")
+        if index is not None:
+            line += (
+                f" | index {len(index['uniques']):,} keys, "
+                f"{index['build_ms']:.0f}ms, {index['bytes'] / 1024 / 1024:.1f} MB"
+            )
+        st.caption(line)
+    
+    built_for, orders = cache["orders"]
+    if built_for is st.session_state.all_data:
+        st.caption(
+            f"Order table: {len(orders['table']):,} rows, {len(orders['uniques']):,} keys, "
+            f"{orders['build_ms']:.0f}ms, {orders['bytes'] / 1024 / 1024:.1f} MB"
+        )
+    
+    search_cache = get_search_cache()
+    with search_cache["lock"]:
+        lookups = search_cache["hits"] + search_cache["misses"]
+        st.caption(
+            f"Search cache: {len(search_cache['entries']):,} entries, "
+            f"{search_cache['bytes'] / 1024 / 1024:.1f} of {SEARCH_CACHE_MB} MB | "
+            f"hit rate {search_cache['hits'] / lookups if lookups else 0:.0%} "
+            f"({search_cache['hits']:,} hits, {search_cache['misses']:,} misses, {search_cache['evictions']:,} evictions)"
+        )
+    
+    st.markdown("**Sources**")
+    sources = pd.DataFrame([source_metrics(name, d) for name, d in st.session_state.all_data.items()])
+    st.dataframe(sources.drop(columns=["error"]).set_index("source"), use_container_width=True)
+    
+    metrics = get_metrics()
+    with metrics["lock"]:
+        searches = list(metrics["searches"])
+        reruns = {page: list(history) for page, history in metrics["reruns"].items()}
+    
+    if searches:
+        last = searches[-1]
+        st.markdown("**Last search**")
+        if "cache_ms" in last:
+            st.caption(
+                f"{last['ids']:,} IDs → {last['results']:,} results | search cache hit {last['cache_ms']:.1f}ms | "
+                f"render {last['render_ms']:.1f}ms"
+            )
+        else:
+            st.caption(
+                f"{last['ids']:,} IDs → {last['results']:,} results | "
+                f"order table {last.get('table_ms', 0):.1f}ms | index lookup {last.get('lookup_ms', 0):.1f}ms | merge {last.get('merge_ms', 0):.1f}ms | "
+                f"render {last['render_ms']:.1f}ms"
+            )
+    
+    if reruns:
+        st.markdown("**Reruns per page (ms)**")
+        st.dataframe(pd.DataFrame([
+            {"page": page, "runs": len(history), "last": history[-1], "median": float(np.median(history)), "max": max(history)}
+            for page, history in reruns.items()
+        ]).set_index("page").round(1), use_container_width=True)
 
 def render_sidebar():
     with st.sidebar:
@@ -610,6 +2287,8 @@ def render_sidebar():
         
         nav_options = [
             ("🔍 Global Search", "global_search"),
+            ("📈 Daily Volume", "daily_volume"),
+            ("🔗 Overlap", "overlap"),
             ("🟠 ECL QC Center", "ECL QC Center"),
             ("🟠 ECL Zone", "ECL Zone"),
             ("🔵 GE QC Center", "GE QC Center"),
@@ -635,14 +2314,21 @@ def render_sidebar():
         st.markdown("---")
         
         if st.session_state.get("data_loaded"):
-            sources_ok = sum(1 for name, d in st.session_state.all_data.items() if name != "_kerry_status_tab" and not d["df"].empty)
-            status_rows = len(st.session_state.all_data.get("_kerry_status_tab", {}).get("df", []))
-            st.success(f"✅ {st.session_state.total_rows:,} rows")
-            st.caption(f"{sources_ok}/6 sources | 📡 {status_rows:,} status")
+            loading = get_data_cache()["loading"]
+            if loading:
+                st.info(f"⏳ {st.session_state.total_rows:,} rows so far")
+            else:
+                st.success(f"✅ {st.session_state.total_rows:,} rows")
+            for name in list(DATA_SOURCES.keys()) + ["_kerry_status_tab"]:
+                st.caption(source_status_line(name, st.session_state.all_data.get(name), loading.get(name)))
+        
+            with st.expander("🛠️ Admin: Performance"):
+                render_admin_panel()
         
         st.markdown("---")
         
         if st.button("🔄 Reload Data", use_container_width=True):
+            invalidate_data_cache()
             for key in list(st.session_state.keys()):
                 del st.session_state[key]
             st.rerun()
@@ -654,6 +2340,86 @@ def render_sidebar():
         
         return st.session_state.current_page
 
+def bulk_search_panel():
+    uploaded = st.file_uploader("Order IDs file", type=["csv", "xlsx"], key="bulk_file")
+    if uploaded is None:
+        st.caption(f"CSV or XLSX with one order ID per row, up to {BULK_MAX_IDS:,} IDs. Matches are downloaded as a gzipped CSV.")
+        return
+    
+    try:
+        df = read_id_file(uploaded)
+    except ImportError:
+        st.error("❌ Reading .xlsx files needs the openpyxl package - upload a CSV instead")
+        return
+    except Exception as e:
+        st.error(f"❌ Could not read {uploaded.name}: {e}")
+        return
+    
+    guesses = find_alias_columns(df.columns, get_display_field("Order Number")["aliases"])
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        column = st.selectbox(
+            "Order ID column",
+            list(df.columns),
+            index=list(df.columns).index(guesses[0]) if guesses else 0,
+            key="bulk_column"
+        )
+    with col2:
+        st.markdown("<br>", unsafe_allow_html=True)
+        partial = st.toggle("Partial matches", key="bulk_partial", help="Also match order IDs containing the searched text (slower)")
+    
+    order_ids = bulk_order_ids(df, column)
+    if not order_ids:
+        st.warning(f"⚠️ No IDs in column {column}")
+        return
+    if len(order_ids) > BULK_MAX_IDS:
+        st.warning(f"⚠️ {len(order_ids):,} IDs in file - only the first {BULK_MAX_IDS:,} are searched")
+        order_ids = order_ids[:BULK_MAX_IDS]
+    st.caption(f"{len(order_ids):,} distinct IDs in {uploaded.name}")
+    
+    run_key = (uploaded.name, uploaded.size, column, partial, st.session_state.data_version)
+    if st.button("▶️ Run bulk search", type="primary", key="bulk_run"):
+        progress = st.progress(0.0, text="Searching...")
+        
+        def on_progress(done, total, matches, seconds):
+            rate = done / seconds if seconds else 0.0
+            progress.progress(done / total, text=f"{done:,} / {total:,} IDs | {matches:,} matches | {rate:,.0f} IDs/s")
+        
+        file, missing, summary = run_bulk_search(order_ids, partial, on_progress)
+        st.session_state.bulk_result = {"key": run_key, "file": file, "missing": missing, "summary": summary}
+    
+    result = st.session_state.get("bulk_result")
+    if result is None or result["key"] != run_key:
+        return
+    
+    summary = result["summary"]
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("IDs", f"{summary['ids']:,}")
+    col2.metric("Found", f"{summary['matched']:,}")
+    col3.metric("Results", f"{summary['results']:,}")
+    col4.metric("Throughput", f"{summary['ids_per_second']:,.0f} IDs/s")
+    st.caption(f"Searched in {summary['seconds']:.1f}s")
+    
+    today = datetime.now().strftime('%Y%m%d')
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            "📥 Download results (CSV gzip)",
+            result["file"],
+            f"bulk_search_{today}.csv.gz",
+            EXPORT_FORMATS["CSV (gzip)"]["mime"],
+            key="bulk_download",
+        )
+    if result["missing"]:
+        with col2:
+            st.download_button(
+                f"📥 Download {len(result['missing']):,} IDs not found (CSV)",
+                lambda: pd.DataFrame({"Order ID": result["missing"]}).to_csv(index=False).encode("utf-8"),
+                f"bulk_not_found_{today}.csv",
+                "text/csv",
+                key="bulk_download_missing",
+            )
+
 def search_page():
     st.markdown("""
     <div class="hero-container">
@@ -662,6 +2428,11 @@ def search_page():
     </div>
     """, unsafe_allow_html=True)
     
+    mode = st.radio("Search mode", ["⌨️ Type IDs", "📂 Upload file"], horizontal=True, label_visibility="collapsed", key="search_mode")
+    if mode == "📂 Upload file":
+        bulk_search_panel()
+        return
+    
     col1, col2 = st.columns([5, 1])
     with col1:
         search_input = st.text_input(
@@ -675,30 +2446,47 @@ def search_page():
     
     st.markdown('<p class="search-hint">💡 Multiple orders: comma ya space se separate karein</p>', unsafe_allow_html=True)
     
+    loading = [name for name in get_data_cache()["loading"] if name in DATA_SOURCES]
+    if loading:
+        st.caption(f"⏳ Still loading: {', '.join(loading)} — results from these sources will appear when they arrive")
+    
     if search_input and search_input.strip():
         order_ids = [x.strip() for x in re.split(r'[\n,\t\s]+', search_input) if x.strip()]
         
         if order_ids:
             start = time.time()
-            results = instant_search(order_ids)
+            results = cached_batch_search(order_ids)
+            all_data = st.session_state.all_data
             search_time = (time.time() - start) * 1000
             
             st.markdown("---")
             
-            if results:
+            if not results.empty:
                 col1, col2, col3, col4 = st.columns(4)
                 col1.metric("Results", len(results))
                 col2.metric("Orders", len(order_ids))
-                col3.metric("Sources", len(set(r["source"] for r in results)))
+                col3.metric("Sources", results["source"].nunique())
                 col4.metric("Speed", f"{search_time:.0f}ms")
                 
                 st.markdown("---")
                 
-                for result in results:
-                    render_result_card(result)
+                export_buttons(
+                    ("search", tuple(order_ids), st.session_state.data_version),
+                    lambda: search_results_frame(results, all_data),
+                    "search_results",
+                    "search_results",
+                )
+                
+                render_ms = render_search_results(results)
             else:
+                render_ms = 0.0
                 st.error(f"❌ No results for: {', '.join(order_ids)}")
                 st.info("💡 Order ID check karein ya different ID try karein")
+            
+            record_search(dict(
+                results.attrs.get("timings", {}),
+                ids=len(order_ids), results=len(results), search_ms=search_time, render_ms=render_ms,
+            ))
     else:
         st.markdown("---")
         counts = get_partner_counts()
@@ -739,19 +2527,37 @@ def search_page():
 
 def data_page(source_name):
     config = DATA_SOURCES[source_name]
-    st.markdown(f"## {config['icon']} {source_name}")
+    
+    col1, col2 = st.columns([5, 1])
+    with col1:
+        st.markdown(f"## {config['icon']} {source_name}")
+    with col2:
+        if st.button("🔄 Refresh", key=f"refresh_{source_name}", use_container_width=True):
+            refresh_source(source_name)
+            if source_name == "Kerry":
+                refresh_source("_kerry_status_tab")
+            st.rerun()
     
     source_data = st.session_state.all_data.get(source_name, {})
     df = source_data.get("df", pd.DataFrame())
     
+    if source_data.get("checked_at"):
+        checked = datetime.fromtimestamp(source_data["checked_at"]).strftime("%H:%M:%S")
+        st.caption(f"Last checked {checked} — {source_data.get('outcome', '')}")
+    
+    if source_name in get_data_cache()["loading"]:
+        st.info(f"⏳ {source_name} is still loading...")
+        return
+    
     if df.empty:
         st.error("No data available")
         return
     
     # =========================================================================
-    # FIND DATE COLUMN AUTOMATICALLY
+    # DATE COLUMN (detected and parsed once per source load)
     # =========================================================================
-    date_col = find_date_column(df)
+    date_col = source_data.get("date_col")
+    stats_start, stats_end = None, None
     
     # =========================================================================
     # DATE FILTER SECTION
@@ -761,13 +2567,8 @@ def data_page(source_name):
     if date_col:
         st.info(f"📅 Date column detected: **{date_col}**")
         
-        # Parse dates
-        df["_parsed_date"] = smart_parse_date(df[date_col])
-        valid_dates = df["_parsed_date"].dropna()
-        
-        if len(valid_dates) > 0:
-            min_date = valid_dates.min().date()
-            max_date = valid_dates.max().date()
+        if source_data.get("date_range"):
+            min_date, max_date = source_data["date_range"]
             
             col1, col2, col3 = st.columns([2, 2, 2])
             
@@ -805,7 +2606,7 @@ def data_page(source_name):
                 st.session_state[filter_key] = False
             
             # Apply filter if active
-            display_df = df.copy()
+            display_df = df
             if st.session_state.get(filter_key, False):
                 stored_start = st.session_state.get(f"start_{source_name}", start_date)
                 stored_end = st.session_state.get(f"end_{source_name}", end_date)
@@ -814,37 +2615,30 @@ def data_page(source_name):
                 start_datetime = pd.Timestamp(stored_start)
                 end_datetime = pd.Timestamp(stored_end) + pd.Timedelta(days=1) - pd.Timedelta(seconds=1)
                 
-                mask = (display_df["_parsed_date"] >= start_datetime) & (display_df["_parsed_date"] <= end_datetime)
-                display_df = display_df[mask]
+                display_df = filter_by_date(source_data, start_datetime, end_datetime)
+                stats_start, stats_end = start_datetime, end_datetime
                 
                 st.success(f"✅ Filter Applied: {stored_start} to {stored_end} | Showing {len(display_df):,} of {len(df):,} rows")
-            
-            # Remove temp column for display
-            if "_parsed_date" in display_df.columns:
-                display_df = display_df.drop(columns=["_parsed_date"])
         else:
             st.warning("⚠️ Could not parse dates from the date column")
-            display_df = df.copy()
+            display_df = df
     else:
         st.warning("⚠️ No date column found. Available columns: " + ", ".join(df.columns[:10].tolist()))
-        display_df = df.copy()
-    
-    # Remove _parsed_date from original df display
-    if "_parsed_date" in df.columns:
-        df = df.drop(columns=["_parsed_date"])
+        display_df = df
     
     st.markdown("---")
     
     # =========================================================================
     # STATS - BOXES & WEIGHT
     # =========================================================================
-    total_boxes, total_weight = calculate_stats(display_df, source_name)
+    # Read off the per-day running totals built at load instead of summing the filtered rows
+    total_orders, total_boxes, total_weight = get_range_stats(source_data, stats_start, stats_end)
     
     st.markdown(f"""
     <div class="stats-container">
         <div class="stat-card">
             <div class="stat-icon">📦</div>
-            <div class="stat-value stat-value-orange">{len(display_df):,}</div>
+            <div class="stat-value stat-value-orange">{total_orders:,}</div>
             <div class="stat-label">Total Orders</div>
         </div>
         <div class="stat-card">
@@ -870,20 +2664,168 @@ def data_page(source_name):
     # =========================================================================
     # SEARCH/FILTER IN TABLE
     # =========================================================================
-    filter_text = st.text_input("🔍 Search in table...", key=f"filter_{source_name}")
+    col1, col2 = st.columns([3, 2])
+    with col1:
+        filter_text = st.text_input("🔍 Search in table...", key=f"filter_{source_name}")
+    with col2:
+        filter_columns = st.multiselect("Columns", df.columns.tolist(), placeholder="All columns", key=f"filter_cols_{source_name}")
     
     if filter_text:
-        mask = display_df.astype(str).apply(lambda x: x.str.contains(filter_text, case=False, na=False)).any(axis=1)
-        display_df = display_df[mask]
+        display_df = filter_table_text(source_data, display_df, filter_text, filter_columns)
+    
+    # =========================================================================
+    # TABLE (one page at a time, sorted server-side)
+    # =========================================================================
+    col1, col2, col3, col4 = st.columns([3, 1, 1, 1])
+    with col1:
+        sort_col = st.selectbox("Sort by", [None] + df.columns.tolist(), format_func=lambda c: "Sheet order" if c is None else c, key=f"sort_col_{source_name}")
+    with col2:
+        ascending = st.selectbox("Order", [True, False], format_func=lambda a: "Ascending" if a else "Descending", key=f"sort_asc_{source_name}")
+    with col3:
+        page_size = st.selectbox("Rows per page", TABLE_PAGE_SIZES, key=f"page_size_{source_name}")
+    
+    page_count = max(1, -(-len(display_df) // page_size))
+    page_key = f"page_{source_name}"
+    if st.session_state.get(page_key, 1) > page_count:
+        st.session_state[page_key] = page_count
+    with col4:
+        page = st.number_input(f"Page (of {page_count:,})", min_value=1, max_value=page_count, step=1, key=page_key)
     
-    st.dataframe(display_df, use_container_width=True, height=400)
+    rows = table_rows(source_data, display_df, sort_col, ascending)
+    page_rows = rows[(page - 1) * page_size:page * page_size]
+    page_df = df.iloc[page_rows]
+    st.dataframe(page_df, use_container_width=True, height=400)
     
-    st.download_button(
-        "📥 Download CSV", 
-        display_df.to_csv(index=False), 
-        f"{source_name}_{datetime.now().strftime('%Y%m%d')}.csv", 
-        "text/csv"
+    if len(page_df):
+        payload = arrow_payload_bytes(page_df)
+        full_estimate = payload / len(page_df) * len(display_df)
+        st.caption(
+            f"Rows {(page - 1) * page_size + 1:,}–{(page - 1) * page_size + len(page_df):,} of {len(display_df):,} | "
+            f"page payload {payload / 1024:,.1f} KB (whole table ≈ {full_estimate / 1024 / 1024:,.1f} MB)"
+        )
+    
+    # Export the rows shown (sheet order), generated only when the button is clicked
+    export_key = (source_name, stats_start, stats_end, filter_text, tuple(filter_columns), st.session_state.data_version)
+    export_buttons(export_key, lambda: display_df, source_name, source_name)
+
+def daily_volume(all_data, start, end, metric, by_source=False):
+    """One column per partner (or source) of a daily metric between start and end, from the load-time daily totals"""
+    columns = {}
+    for name, config in DATA_SOURCES.items():
+        daily = all_data.get(name, {}).get("daily_totals", {}).get("daily")
+        if daily is None:
+            continue
+        window = daily[metric].loc[pd.Timestamp(start):pd.Timestamp(end)]
+        key = name if by_source else config["partner"]
+        columns[key] = columns[key].add(window, fill_value=0) if key in columns else window
+    return pd.DataFrame(columns).fillna(0).sort_index()
+
+def volume_page():
+    st.markdown("## 📈 Daily Volume")
+    
+    all_data = st.session_state.all_data
+    ranges = [d["date_range"] for name, d in all_data.items() if name in DATA_SOURCES and d.get("date_range")]
+    if not ranges:
+        st.error("No dated data available")
+        return
+    min_date = min(r[0] for r in ranges)
+    max_date = max(r[1] for r in ranges)
+    
+    col1, col2, col3, col4 = st.columns([2, 2, 2, 1])
+    with col1:
+        start_date = st.date_input(
+            "From Date",
+            value=max(min_date, max_date - timedelta(days=30)),
+            min_value=min_date,
+            max_value=max_date,
+            key="volume_start"
+        )
+    with col2:
+        end_date = st.date_input("To Date", value=max_date, min_value=min_date, max_value=max_date, key="volume_end")
+    with col3:
+        metric_label = st.selectbox("Metric", ["Boxes", "Weight (kg)", "Orders"], key="volume_metric")
+    with col4:
+        st.markdown("<br>", unsafe_allow_html=True)
+        by_source = st.toggle("By source", key="volume_by_source")
+    
+    metric = {"Boxes": "boxes", "Weight (kg)": "weight", "Orders": "orders"}[metric_label]
+    end_datetime = pd.Timestamp(end_date) + pd.Timedelta(days=1) - pd.Timedelta(seconds=1)
+    
+    # Range totals per partner come straight from the running totals
+    totals = {}
+    for name, config in DATA_SOURCES.items():
+        source_data = all_data.get(name, {})
+        if source_data.get("daily_totals", {}).get("daily") is None:
+            continue
+        orders, boxes, weight = get_range_stats(source_data, start_date, end_datetime)
+        key = name if by_source else config["partner"]
+        total = totals.setdefault(key, {"icon": config["icon"], "orders": 0, "boxes": 0, "weight": 0.0})
+        total["orders"] += orders
+        total["boxes"] += boxes
+        total["weight"] += weight
+    
+    cards = "".join(
+        f"""<div class="stat-card">
+            <div class="stat-icon">{total['icon']}</div>
+            <div class="stat-value stat-value-blue">{total['boxes']:,}</div>
+            <div class="stat-label">{key} boxes | {total['weight']:,.2f} kg | {total['orders']:,} orders</div>
+        </div>"""
+        for key, total in totals.items()
+    )
+    st.markdown(f'<div class="stats-container">{cards}</div>', unsafe_allow_html=True)
+    
+    volume = daily_volume(all_data, start_date, end_datetime, metric, by_source)
+    if volume.empty:
+        st.info("No rows in this date range")
+        return
+    
+    st.bar_chart(volume)
+    
+    table = volume.copy()
+    table.index = table.index.date
+    table["Total"] = table.sum(axis=1)
+    st.dataframe(table.round(2), use_container_width=True)
+
+def overlap_page():
+    st.markdown("## 🔗 Partner Overlap")
+    
+    all_data = st.session_state.all_data
+    if not any(name in DATA_SOURCES for name in all_data):
+        st.error("No data available")
+        return
+    if get_data_cache()["loading"]:
+        st.info("⏳ Some sources are still loading - counts cover loaded sources only")
+    
+    orders = get_order_table(get_data_cache(), all_data)
+    if orders is None:
+        st.info("⏳ The cross-partner order table is still being built - this page fills in once it is ready")
+        return
+    
+    st.markdown("#### Orders shared by each pair of sources")
+    st.dataframe(overlap_matrix(orders), use_container_width=True)
+    
+    sources = st.multiselect(
+        "Orders that appear in all of",
+        list(DATA_SOURCES),
+        default=["ECL Zone", "Kerry"],
+        key="overlap_sources"
     )
+    if not sources:
+        return
+    
+    shared = order_overlap(orders, sources)
+    col1, col2 = st.columns(2)
+    col1.metric("Shared Orders", f"{shared['order_key'].nunique():,}")
+    col2.metric("Rows", f"{len(shared):,}")
+    
+    # "Latest Status" already prefers the Kerry live status
+    shared = shared.drop(columns=["order_key", "source_pos", "row", "live_status", "order_number"]).rename(columns={"source": "Source"})
+    
+    st.dataframe(shared.head(TABLE_PAGE_SIZES[-1]), use_container_width=True, height=400, hide_index=True)
+    if len(shared) > TABLE_PAGE_SIZES[-1]:
+        st.caption(f"Showing first {TABLE_PAGE_SIZES[-1]:,} of {len(shared):,} rows - download for all")
+    
+    export_buttons(("overlap", tuple(sources), st.session_state.data_version), lambda: shared, "order_overlap", "overlap")
 
 # =============================================================================
 # MAIN
@@ -898,14 +2840,30 @@ def main():
         
         with st.spinner("Loading 6 sources + Kerry status tab..."):
             initialize_data()
+            # Open the app as soon as the fastest source is in; the rest stream in behind it
+            while get_data_cache()["loading"] and not any(name in DATA_SOURCES for name in st.session_state.all_data):
+                time.sleep(0.1)
+                initialize_data()
         st.rerun()
     
+    initialize_data()
     page = render_sidebar()
     
+    rerun_start = time.perf_counter()
     if page == "global_search":
         search_page()
+    elif page == "daily_volume":
+        volume_page()
+    elif page == "overlap":
+        overlap_page()
     else:
         data_page(page)
+    record_rerun(page, (time.perf_counter() - rerun_start) * 1000)
+    
+    # Pick up sources that are still arriving
+    if get_data_cache()["loading"]:
+        time.sleep(LOAD_POLL_SECONDS)
+        st.rerun()
 
 if __name__ == "__main__":
     main()